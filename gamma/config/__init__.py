@@ -11,12 +11,22 @@ dispatch = Dispatcher()
 
 from ruamel.yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
 
-from .builtin_tags import yaml
+from .builtin_tags import refresh_env, set_env_detection, yaml
 from .confignode import ConfigNode, RootConfig, config_context, push_entry, remove_entry
+from .call_executor import CallTimeoutError
 from .dump_dict import to_dict
-from .dump_yaml import to_yaml
+from .dump_yaml import iter_yaml, to_yaml
+from .dump_json import from_json, to_json
+from .dump_binary import from_binary, to_binary
+from .frozen import FrozenConfig
+from .render_plan import RenderPlan, compile_plan
+from .depgraph import ReferenceCycleError, check_references, render_ordered
 from .globalconfig import get_config, reset_config
+from .env_override import refresh_env_override
+from .aio import aget, ato_dict
+from .secrets import SecretBackend, SQLiteSecretBackend, register_secret_backend
 from .render import render_node
+from .memo import invalidate_memo, memoize_tag, unmemoize_tag
 from .render_context import ContextVar, context_providers
 from .tags import Tag
 from .findconfig import set_config_roots, is_config_roots_set, append_config_root
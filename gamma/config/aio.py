@@ -0,0 +1,86 @@
+"""Module implementing the `asyncio` rendering API.
+
+Rendering runs in the event loop default executor, so sync tag handlers doing I/O don't
+block the loop. Tag handlers can also be `async def render_node` methods: their
+coroutines are collected from the rendered tree and awaited concurrently in the loop.
+"""
+
+import asyncio
+import functools
+import inspect
+
+from beartype.typing import Any, Iterable, List, Tuple, Union
+
+from .confignode import ConfigNode
+from .dump_dict import to_dict
+
+
+def _collect_awaitables(out: Any) -> List[Tuple[Any, Any, Any]]:
+    """Return the `(container, key, awaitable)` positions in a rendered tree"""
+
+    found = []
+    stack = [out] if isinstance(out, (dict, list)) else []
+    while stack:
+        cur = stack.pop()
+        items = cur.items() if isinstance(cur, dict) else enumerate(cur)
+        for k, v in items:
+            if inspect.isawaitable(v):
+                found.append((cur, k, v))
+            elif isinstance(v, (dict, list)):
+                stack.append(v)
+    return found
+
+
+async def resolve_awaitables(out: Any) -> Any:
+    """Await the values returned by async tag handlers in a rendered tree,
+    concurrently, replacing them by their results."""
+
+    if inspect.isawaitable(out):
+        return await out
+
+    found = _collect_awaitables(out)
+    if found:
+        results = await asyncio.gather(*(aw for _, _, aw in found))
+        for (container, key, _), result in zip(found, results):
+            container[key] = result
+    return out
+
+
+async def _run_sync(func, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def ato_dict(node, **ctx) -> Any:
+    """Async version of `to_dict`, accepting the same arguments."""
+
+    if "config" not in ctx and not isinstance(node, ConfigNode):
+        from .globalconfig import get_config
+
+        # load the global config in the loop thread, that owns it
+        ctx["config"] = get_config()
+
+    out = await _run_sync(to_dict, node, **ctx)
+    return await resolve_awaitables(out)
+
+
+def _get_path(cfg: ConfigNode, keys: Iterable) -> Any:
+    out = cfg
+    for key in keys:
+        out = out[key]
+    return out
+
+
+async def aget(cfg: ConfigNode, path: Union[str, Iterable]) -> Any:
+    """Async version of `cfg[...]` lookups.
+
+    Args:
+        path: a sequence of keys, or a string in the `!ref` dot notation, like
+            `"foo.bar"`.
+    """
+
+    from .builtin_tags import parse_ref_path
+
+    keys = parse_ref_path(path) if isinstance(path, str) else tuple(path)
+    out = await _run_sync(_get_path, cfg, keys)
+    return await resolve_awaitables(out)
@@ -1,26 +1,60 @@
 """Module that implements renderers for builtin-tags"""
 
+import copy
+import functools
 import importlib
+import mmap
+import operator
 import os
 import re
-import threading
+import shlex
 import warnings
-
-from beartype.typing import Any, List, Union
+from array import array
+from pathlib import Path
+from types import CodeType
+
+from beartype.typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 from ruamel.yaml import YAML
 from ruamel.yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
 
 from gamma.config import dispatch
-from gamma.config.confignode import ConfigNode
+from gamma.config.confignode import (
+    ConfigNode,
+    _allow_dot_access,
+    config_getentry,
+    resolve_item,
+)
 from gamma.config.dump_dict import to_dict
 
+from . import tags
+from .cache import Cache, cache
+from .call_executor import run_call
 from .findconfig import get_config_roots
+from .load import load_node
+from .precompile import precompile_node
+from .rawnodes import is_equal, is_static
 from .render import render_node
-from .render_context import get_render_context
+from .render_context import eager_ctx, get_code_names, get_render_context
 from .tags import Tag, TagException
 
 UNDEFINED = "~~UNDEFINED~~"
-VALID_MODIFIERS = ("dump", "secret")
+VALID_MODIFIERS = ("dump", "secret", "cache")
+TAG_MODIFIERS = {"!call": ("timeout",), "!file": ("bytes", "text")}
+EXPR_CACHE_SIZE = 1024
+J2_CACHE_SIZE = 1024
+REF_CACHE_SIZE = 1024
+ENV_CACHE_SIZE = 1024
+CALL_PATTERN = re.compile(r"([a-zA-Z_][\w\.:]*)\(.*?\)")
 
 yaml = YAML(typ="safe")
 
@@ -34,15 +68,39 @@ CallTag = Tag["!call"]
 PyTag = Tag["!py"]
 ObjTag = Tag["!obj"]
 PathTag = Tag["!path"]
+IncludeTag = Tag["!include"]
+FileTag = Tag["!file"]
+ArrayTag = Tag["!array"]
+
+ARRAY_TYPES = {
+    "f4": ("f", "float32"),
+    "f8": ("d", "float64"),
+    "i4": ("i", "int32"),
+    "i8": ("q", "int64"),
+}
+"""Supported `!array` element types, mapped to `array` typecodes and NumPy dtypes"""
+
+ARRAY_NUMBER_TAGS = (f"{tags.CORE_TAG_PREFIX}int", f"{tags.CORE_TAG_PREFIX}float")
+"""Tags of the `!array` items parsed directly, without rendering them"""
+
+ROOT_RELATIVE_SCHEMES = ("!path", "!include", "!file")
 
-j2_cache = threading.local()
+_env_state = {"detect": True, "version": 0}
 
 
-def get_modifiers(path) -> List[str]:
+def get_modifiers(path, scheme=None) -> List[str]:
+    """Return the modifiers of a tag path, also accepting the ones in
+    `TAG_MODIFIERS[scheme]`, eg. `get_modifiers("dump:timeout=2", "!call")`"""
+    return list(_parse_modifiers(path, scheme))
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_modifiers(path, scheme=None) -> Tuple[str, ...]:
     if not path:
-        return []
-    mods = path.split(":")
-    assert all(mod in VALID_MODIFIERS for mod in mods), f"Invalid tag: {path}"
+        return ()
+    valid = VALID_MODIFIERS + TAG_MODIFIERS.get(scheme, ())
+    mods = tuple(path.split(":"))
+    assert all(mod.split("=", 1)[0] in valid for mod in mods), f"Invalid tag: {path}"
     return mods
 
 
@@ -50,6 +108,15 @@ def mod_force_dump(modifiers) -> bool:
     return "dump" in modifiers
 
 
+def mod_timeout(modifiers) -> Optional[float]:
+    """Return the value of a `timeout=<seconds>` modifier, if any"""
+    for mod in modifiers:
+        name, _, value = mod.partition("=")
+        if name == "timeout":
+            return float(value)
+    return None
+
+
 def mod_secret(modifiers) -> bool:
     return "secret" in modifiers
 
@@ -68,23 +135,69 @@ def render_node(node: Node, tag: EnvTag, *, dump=False, path=None, **ctx):
         my_var: !env MYVAR|my_default
     """
 
-    modifiers = get_modifiers(path)
+    modifiers = _parse_modifiers(path)
     if dump and not mod_force_dump(modifiers):
         return node
 
-    name = node.value
-    name, default = _split_default(name)
+    if _env_state["detect"]:
+        env_val = _get_env(node.value)
+    else:
+        env_val = _get_env_cached(node.value)
+
+    if isinstance(env_val, (dict, list)):
+        env_val = copy.deepcopy(env_val)
+    return env_val
+
+
+def _get_env_cached(value: str) -> Any:
+    """Return `_get_env(value)`, cached until `refresh_env` is called"""
+    version = _env_state["version"]
+    key = ("env", value)
+    entry = cache.get(key)
+    if entry is None or entry[0] != version:
+        # a single slot per value, so old versions are replaced
+        entry = cache[key] = (version, _get_env(value))
+    return entry[1]
+
+
+def _get_env(value: str) -> Any:
+    name, default = _split_default(value)
     env_val = os.getenv(name, default)
     if env_val == UNDEFINED:
         raise TagException(
             f"Env variable '{name}' not found when resolving node and no default set"
         )
     elif env_val is not None:
-        env_val = yaml.load(env_val)
+        env_val = parse_env_value(env_val)
 
     return env_val
 
 
+@functools.lru_cache(maxsize=ENV_CACHE_SIZE)
+def parse_env_value(value: str) -> Any:
+    """Parse an environment variable value as YAML, caching the result by value."""
+    return yaml.load(value)
+
+
+def refresh_env() -> None:
+    """Make `!env` nodes read the environment again.
+
+    Only needed if change detection was disabled with `set_env_detection(False)`.
+    """
+    _env_state["version"] += 1
+
+
+def set_env_detection(enabled: bool) -> None:
+    """Enable or disable environment change detection for `!env` nodes.
+
+    When enabled (the default), the environment is read on every render and only the
+    YAML parsing is cached. When disabled, rendered values are kept until
+    `refresh_env` or `reset_config` is called.
+    """
+    _env_state["detect"] = enabled
+    refresh_env()
+
+
 # process: !expr
 @dispatch
 def render_node(node: Node, tag: ExprTag, *, path=None, dump=False, **ctx):
@@ -98,13 +211,27 @@ def render_node(node: Node, tag: ExprTag, *, path=None, dump=False, **ctx):
     own variables to the context.
     """
 
-    modifiers = get_modifiers(path)
+    modifiers = _parse_modifiers(path)
     if dump and not mod_force_dump(modifiers):
         return node
 
+    code = compile_expr(node.value)
+    names = get_code_names(code)
     _locals = {}
-    _globals = get_render_context(node=node, tag=tag, **ctx)
-    return eval(node.value, _globals, _locals)
+    _globals = get_render_context(names=names, node=node, tag=tag, **ctx)
+    return eval(code, _globals, _locals)
+
+
+@functools.lru_cache(maxsize=EXPR_CACHE_SIZE)
+def compile_expr(source: str) -> CodeType:
+    """Compile an `!expr` source string, caching the code object by source."""
+    return compile(source, "<!expr>", "eval")
+
+
+@dispatch
+def precompile_node(node: Node, tag: ExprTag):
+    """[!expr] Compile the expression, reporting syntax errors at load time"""
+    compile_expr(node.value)
 
 
 @dispatch
@@ -129,40 +256,34 @@ def render_node(
 
         j2_env: my_app.my_module:my_func
 
+    Compiled templates can be persisted by setting `j2_bytecode_cache` to a cache
+    folder path, or `true` to use Jinja2's default temporary folder.
+
     Notes:
         * Jinja2 is not installed by default, you should install it manually.
         * By default, it will dump values, including transitive references.
     """
 
-    modifiers = get_modifiers(path)
+    modifiers = _parse_modifiers(path)
     if dump and mod_secret(modifiers):
         return node
 
     try:
         import jinja2
         import jinja2.exceptions
-        from jinja2.runtime import StrictUndefined
     except ModuleNotFoundError:  # pragma: no cover
         raise Exception(
             "Could not find Jinja2 installed. You must manually install it with "
             "`pip install jinja2` if you want to use the !j2 tag"
         )
 
-    render_ctx = get_render_context(node=node, tag=tag, config=config, key=key, **ctx)
-
-    if not hasattr(j2_cache, "env"):
-        root = config and config._root
-        env_factory = root.get("j2_env")
-        if env_factory:
-            module_name, func_name = env_factory.split(":", 1)
-            mod = importlib.import_module(module_name)
-            func = getattr(mod, func_name)
-            j2_cache.env = func()
-        else:
-            j2_cache.env = jinja2.Environment(undefined=StrictUndefined)
+    template, names = get_j2_template(get_j2_env(config), node.value)
+    render_ctx = get_render_context(
+        names=names, node=node, tag=tag, config=config, key=key, **ctx
+    )
 
     try:
-        res = j2_cache.env.from_string(node.value).render(**render_ctx)
+        res = template.render(**render_ctx)
     except jinja2.exceptions.UndefinedError as ex:
         msg = f'Error rendering key `{key.value}: "{node.value}"` -> {ex.message}'
         raise ValueError(msg)
@@ -170,6 +291,83 @@ def render_node(
     return res
 
 
+def get_j2_env(config: ConfigNode = None):
+    """Return the Jinja2 environment for the config's root object.
+
+    The environment is created once per `RootConfig` and shared across threads. It's
+    rebuilt when entries are pushed or removed from the root.
+    """
+
+    root = config and config._root
+    store = root._cache if root is not None else cache
+    return store.get_or_create("j2_env", functools.partial(_create_j2_env, root))
+
+
+def _create_j2_env(root):
+    import jinja2
+    from jinja2.runtime import StrictUndefined
+
+    env_factory = root and root.get("j2_env")
+    if env_factory:
+        module_name, func_name = env_factory.split(":", 1)
+        mod = importlib.import_module(module_name)
+        func = getattr(mod, func_name)
+        env = func()
+    else:
+        env = jinja2.Environment(undefined=StrictUndefined)
+
+    bcc_dir = root and root.get("j2_bytecode_cache")
+    if bcc_dir and env.bytecode_cache is None:
+        if bcc_dir is True:
+            env.bytecode_cache = jinja2.FileSystemBytecodeCache()
+        else:
+            os.makedirs(bcc_dir, exist_ok=True)
+            env.bytecode_cache = jinja2.FileSystemBytecodeCache(bcc_dir)
+
+    return env
+
+
+def get_j2_template(env, source: str):
+    """Return a compiled Jinja2 template and its undeclared variable names.
+
+    Results are cached by source string on a LRU cache per environment, kept as an
+    environment attribute so it's released along with it.
+    """
+
+    from jinja2 import meta
+    from jinja2.utils import LRUCache
+
+    templates = getattr(env, "_gamma_templates", None)
+    if templates is None:
+        with cache.lock:
+            templates = getattr(env, "_gamma_templates", None)
+            if templates is None:
+                templates = env._gamma_templates = LRUCache(J2_CACHE_SIZE)
+
+    try:
+        return templates[source]
+    except KeyError:
+        pass
+
+    ast = env.parse(source)
+    names = frozenset(meta.find_undeclared_variables(ast))
+
+    bcc = env.bytecode_cache
+    if bcc is None:
+        template = env.from_string(ast)
+    else:
+        # same as `jinja2.BaseLoader.load`, using the source as template name
+        bucket = bcc.get_bucket(env, source, None, source)
+        if bucket.code is None:
+            bucket.code = env.compile(ast)
+            bcc.set_bucket(bucket)
+        globals = env.make_globals(None)
+        template = env.template_class.from_code(env, bucket.code, globals)
+
+    entry = templates[source] = (template, names)
+    return entry
+
+
 # process: !j2_secret
 @dispatch
 def render_node(node: Node, tag: J2SecretTag, *, dump=False, **ctx):
@@ -187,29 +385,63 @@ def render_node(node: Node, tag: RefTag, *, config=None, recursive=False, **ctx)
 
     Navigate the object using the dot notation. Complex named keys can be accessed
     using quotes.
+
+    The target node is memoized per root config, until entries are pushed or
+    removed, so only the target itself is rendered on each call.
     """
 
-    import functools
-    import operator
-    import shlex
+    tokens = parse_ref_path(node.value)
+    root = config._root
+    target = root._cache.get_or_create(
+        ("ref", tokens), functools.partial(_resolve_ref_target, root, tokens)
+    )
+
+    if target is None:
+        # path crosses a tagged node, so we need to render the way down
+        parent = functools.reduce(operator.getitem, tokens[:-1], root)
+        val = parent[tokens[-1]]
+    else:
+        parent, key, target_node = target
+        with _allow_dot_access(root):
+            val = resolve_item(target_node, key=key, config=parent, dump=False)
 
-    lex = shlex.shlex(instream=node.value, posix=True)
+    if recursive:
+        while isinstance(val, (ConfigNode, Node)):
+            # chain dump if needed
+            val = render_node(val, config=config, recursive=recursive, **ctx)
+
+    return val
+
+
+@functools.lru_cache(maxsize=REF_CACHE_SIZE)
+def parse_ref_path(value: str) -> Tuple[str, ...]:
+    """Split a `!ref` dot notation path into key tokens, handling quoted keys."""
+
+    lex = shlex.shlex(instream=value, posix=True)
     lex.whitespace = "."
     tokens = []
     token = lex.get_token()
     while token:
         tokens.append(token)
         token = lex.get_token()
+    return tuple(tokens)
 
-    parent = functools.reduce(operator.getitem, tokens[:-1], config._root)
-    val = parent[tokens[-1]]
 
-    if recursive:
-        while isinstance(val, (ConfigNode, Node)):
-            # chain dump if needed
-            val = render_node(val, config=config, recursive=recursive, **ctx)
+def _resolve_ref_target(root, tokens):
+    """Return the `(parent, key, node)` target of a `!ref` path.
 
-    return val
+    Return `None` if the path crosses anything but plain `map` nodes.
+    """
+
+    parent = root
+    for token in tokens[:-1]:
+        _, node = config_getentry(parent, token)
+        if not (isinstance(node, MappingNode) and node.tag == tags.Map().name):
+            return None
+        parent = ConfigNode(node, root=root, parent=parent)
+
+    key, node = config_getentry(parent, tokens[-1])
+    return parent, key, node
 
 
 def _resolve_callable(fq_name: str):
@@ -228,26 +460,32 @@ def _resolve_callable(fq_name: str):
     return func
 
 
-# process: !call <scalar>
-@dispatch
-def render_node(node: ScalarNode, tag: CallTag, *, dump=False, path=None, **ctx):
-    """[!call <scalar>] Call `eval()` on the arguments.
+class CallPlan(NamedTuple):
+    """A compiled `!call <scalar>` node: the rewritten code, the resolved callables
+    and the render context names it reads."""
 
-    Accepts `dump` modifier.
+    code: CodeType
+    funcs: Dict[str, Callable]
+    names: FrozenSet[str]
 
-    It detects and load qualified function calls."""
 
-    modifiers = get_modifiers(path)
-    if dump and not mod_force_dump(modifiers):
-        return node
+def compile_call(source: str) -> CallPlan:
+    """Compile a `!call <scalar>` source into a `CallPlan`.
 
+    Plans are cached by source in the global cache, cleared on `reset_config`.
+    """
+    return cache.get_or_create(
+        ("call", source), functools.partial(_compile_call, source)
+    )
+
+
+def _compile_call(source: str) -> CallPlan:
     func_map = {}
-    code = node.value
+    code = source
 
     # use regex to parse node value
-    pattern = re.compile(r"([a-zA-Z_][\w\.:]*)\(.*?\)")
     pos = 0
-    while match := pattern.match(code, pos=pos):
+    while match := CALL_PATTERN.match(code, pos=pos):
         # Get the fully qualified function name
         fq_name = match.group(1)
         if not fq_name:
@@ -257,7 +495,7 @@ def render_node(node: ScalarNode, tag: CallTag, *, dump=False, path=None, **ctx)
             func = _resolve_callable(fq_name)
         except ValueError as ex:
             msg = ex.args[0]
-            raise ValueError(f"Error in '!call {code}': {msg}")
+            raise ValueError(f"Error in '!call {source}': {msg}")
 
         # Replace the fq name with a valid Python identifier and add to fmap
         new_name = fq_name.replace(":", "__").replace(".", "__")
@@ -267,41 +505,144 @@ def render_node(node: ScalarNode, tag: CallTag, *, dump=False, path=None, **ctx)
         pos = s + len(new_name) + 1
         match = None
 
-    # eval the updated code with the correct function references
-    _locals = {}
-    _globals = get_render_context(node=node, tag=tag, **ctx)
-    _globals.update(func_map)
-    return eval(code, _globals, _locals)
+    code = compile(code, "<!call>", "eval")
+    names = frozenset(get_code_names(code).difference(func_map))
+    return CallPlan(code, func_map, names)
 
 
-# process: !call <mapping>
+# process: !call <scalar>
 @dispatch
-def render_node(node: MappingNode, tag: CallTag, *, dump=False, path=None, **ctx):
-    """[!call <mapping>] Call `eval()` on the arguments.
+def render_node(
+    node: ScalarNode,
+    tag: CallTag,
+    *,
+    dump=False,
+    path=None,
+    call_executor=None,
+    call_deadline=None,
+    **ctx,
+):
+    """[!call <scalar>] Call `eval()` on the arguments.
 
-    Accepts `dump` modifier.
+    Accepts `dump` and `timeout=<seconds>` modifiers.
 
-    Requires `_func` or `func` keys in the mapping"""
+    It detects and load qualified function calls."""
 
-    modifiers = get_modifiers(path)
+    modifiers = _parse_modifiers(path, "!call")
     if dump and not mod_force_dump(modifiers):
         return node
 
-    args: dict = to_dict(node)
+    # eval the updated code with the correct function references
+    plan = compile_call(node.value)
+    _locals = {}
+    _globals = get_render_context(names=plan.names, node=node, tag=tag, **ctx)
+    _globals.update(plan.funcs)
+    return run_call(
+        functools.partial(eval, plan.code, _globals, _locals),
+        f"!call {node.value}",
+        timeout=mod_timeout(modifiers),
+        deadline=call_deadline,
+        executor=call_executor,
+    )
+
 
-    fq_name = args.pop("_func", None) or args.pop("func", None)
+@dispatch
+def precompile_node(node: ScalarNode, tag: CallTag):
+    """[!call <scalar>] Compile the call, reporting errors at load time"""
+    compile_call(node.value)
+
+
+def _get_call_map_plan(
+    node: MappingNode, config=None
+) -> Tuple[Optional[Callable], Optional[dict]]:
+    """Return the resolved callable and arguments of a `!call <mapping>` node, or
+    `None` for the ones that must be rendered on every call.
+
+    Plans are memoized per root config, until entries are pushed or removed.
+    """
 
+    root = getattr(config, "_root", None)
+    if root is None:
+        return _compile_call_map(node)
+
+    key = ("call_map", id(node))
+    entry = root._cache.get(key)
+    if entry is None or entry[0] is not node:
+        # keep a reference to the node, so its id can't be reused
+        entry = root._cache[key] = (node, _compile_call_map(node))
+    return entry[1]
+
+
+def _compile_call_map(node: MappingNode) -> Tuple[Optional[Callable], Optional[dict]]:
+    func = args = None
+    if is_static(node):
+        args = to_dict(node)
+        fq_name = _pop_call_func(args)
+        func = _resolve_call_func(fq_name)
+    else:
+        for item_key, item_value in node.value:
+            if is_equal(item_key, "_func") or is_equal(item_key, "func"):
+                if is_static(item_value):
+                    func = _resolve_call_func(to_dict(item_value))
+                break
+    return func, args
+
+
+def _pop_call_func(args: dict):
+    fq_name = args.pop("_func", None) or args.pop("func", None)
     if fq_name is None:
         msg = f"No '_func' or 'func' key found in mapping {args}"
         raise ValueError(f"Error in '!call <mapping>': {msg}")
+    return fq_name
 
+
+def _resolve_call_func(fq_name):
     try:
-        func = _resolve_callable(fq_name)
+        return _resolve_callable(fq_name)
     except ValueError as ex:
         msg = ex.args[0]
         raise ValueError(f"Error in '!call <mapping>': {msg}")
 
-    return func(**args)
+
+# process: !call <mapping>
+@dispatch
+def render_node(
+    node: MappingNode,
+    tag: CallTag,
+    *,
+    dump=False,
+    path=None,
+    call_executor=None,
+    call_deadline=None,
+    **ctx,
+):
+    """[!call <mapping>] Call `eval()` on the arguments.
+
+    Accepts `dump` and `timeout=<seconds>` modifiers.
+
+    Requires `_func` or `func` keys in the mapping"""
+
+    modifiers = _parse_modifiers(path, "!call")
+    if dump and not mod_force_dump(modifiers):
+        return node
+
+    func, args = _get_call_map_plan(node, ctx.get("config"))
+    if args is not None:
+        # the callable may mutate its arguments
+        args = copy.deepcopy(args)
+    else:
+        args = to_dict(node)
+        fq_name = _pop_call_func(args)
+        if func is None:
+            func = _resolve_call_func(fq_name)
+
+    return run_call(
+        functools.partial(func, **args),
+        f"!call <mapping> {getattr(func, '__qualname__', func)}",
+        timeout=mod_timeout(modifiers),
+        deadline=call_deadline,
+        executor=call_executor,
+    )
 
 
 # process: !py
@@ -364,7 +705,7 @@ def render_node(
     )
 
     func = _py_tag_get_func("py", path)
-    val = to_dict(node, **ctx)
+    val = to_dict(node, **eager_ctx(ctx))
     return func(val)
 
 
@@ -491,13 +832,256 @@ def render_node(node: Node, tag: PathTag, **ctx) -> str:
         my_var: !path data/hello_world.csv
     """
     path_fragment = node.value
-    roots = get_config_roots()
-    if len(roots) > 1:
-        raise ValueError("More than one root defined, cannot use !path")
-    base = get_config_roots()[0].parent
+    base = _get_path_base(node, ctx.get("config"))
     return str(base.joinpath(path_fragment).absolute())
 
 
+def _get_path_base(node: Node, config) -> Path:
+    """Return the parent of the config root folder the node was loaded from"""
+    return _get_config_root(node, config, "!path").parent
+
+
+def _get_config_root(node: Node, config, tag_name: str) -> Path:
+    """Return the config root folder the node was loaded from"""
+
+    root = getattr(config, "_root", None)
+    roots = None
+    if root is not None:
+        entry_key = root._cache.get_or_create(
+            "path_entries", functools.partial(_index_path_nodes, root)
+        ).get(id(node))
+        config_root = root._entry_roots.get(entry_key)
+        if config_root is not None:
+            return config_root
+        roots = root._config_roots
+
+    if roots is None:
+        roots = cache.get_or_create("config_roots", get_config_roots)
+
+    if len(roots) > 1:
+        raise ValueError(f"More than one root defined, cannot use {tag_name}")
+    return roots[0]
+
+
+def _index_path_nodes(root) -> Dict[int, str]:
+    """Map the root-relative nodes (eg. `!path`) in each entry to the entry key"""
+    out = {}
+    for entry_key, entry in root._root_nodes.items():
+        stack = [entry]
+        while stack:
+            node = stack.pop()
+            if tags.parse_tag(node.tag).scheme in ROOT_RELATIVE_SCHEMES:
+                out[id(node)] = entry_key
+            elif isinstance(node, MappingNode):
+                stack.extend(value for _, value in node.value)
+            elif isinstance(node, SequenceNode):
+                stack.extend(node.value)
+    return out
+
+
+# process: !include
+@dispatch
+def render_node(
+    node: ScalarNode,
+    tag: IncludeTag,
+    *,
+    config=None,
+    dump=False,
+    recursive=False,
+    **ctx,
+) -> Any:
+    """[!include] Load a YAML (or JSON) file, relative to the config root folder, as a
+    config subtree.
+
+    The file is only parsed when the value is first accessed, and kept until it's
+    modified.
+
+    Examples:
+        # should load `<config-root>/generated/routes.yaml`
+        routes: !include generated/routes.yaml
+    """
+
+    base = _get_config_root(node, config, "!include")
+    included = load_include(base.joinpath(node.value).absolute())
+
+    if dump:
+        from .dump_yaml import dump_node
+
+        return dump_node(included, config=config, render_pass=ctx.get("render_pass"))
+
+    if recursive:
+        return render_node(included, config=config, dump=dump, recursive=True, **ctx)
+
+    return resolve_item(included, config=config, dump=dump, **ctx)
+
+
+def load_include(path: Path) -> Node:
+    """Return the parsed node of an included file, cached by path and mtime"""
+
+    stamp = _file_stamp(path)
+    return _get_stamped(("include", str(path)), stamp, lambda: load_node(path))
+
+
+# process: !file
+@dispatch
+def render_node(
+    node: ScalarNode, tag: FileTag, *, path=None, dump=False, config=None, **ctx
+) -> Any:
+    """[!file] Return a file content, with a path relative to the *parent* of the
+    config root directory, like `!path`.
+
+    By default (or with `!file:bytes`) item access returns a read-only `memoryview`
+    over a memory mapping of the file, while `to_dict`, exports and `!file:dump`
+    return a `bytes` copy, which can be pickled and copied. With `!file:text` returns
+    the content decoded as UTF-8. Mappings are shared by all nodes and threads of a
+    root config reading the same file, refreshed when it's modified and released
+    with the root config. The content is not dumped, unless using `!file:dump`.
+
+    Examples:
+        thresholds: !file models/thresholds.bin
+        template: !file:text templates/email.txt
+    """
+
+    modifiers = _parse_modifiers(path, "!file")
+    if dump and not mod_force_dump(modifiers):
+        return node
+
+    fpath = _get_path_base(node, config).joinpath(node.value).absolute()
+    root = getattr(config, "_root", None)
+    store = cache if root is None else root._cache
+    if "text" in modifiers:
+        return load_file_text(fpath, store)
+
+    out = load_file(fpath, store)
+    if dump or ctx.get("recursive"):
+        return out.tobytes()
+    return out
+
+
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_stamped(key, stamp, factory: Callable[[], Any], store: Cache = cache) -> Any:
+    """Return a `store` value for `key`, recreating it if `stamp` changed"""
+    entry = store.get(key)
+    if entry is None or entry[0] != stamp:
+        with store.lock:
+            entry = store.get(key)
+            if entry is None or entry[0] != stamp:
+                entry = store[key] = (stamp, factory())
+    return entry[1]
+
+
+def load_file(path: Path, store: Cache = cache) -> memoryview:
+    """Return a read-only `memoryview` over a memory mapping of a file, cached in
+    `store` by path and mtime.
+
+    The mapping is closed once the view and its copies are released, so pass a root
+    config `_cache` to release it with the root.
+    """
+
+    def create():
+        if stamp[1] == 0:
+            # empty files can't be mapped
+            return memoryview(b"")
+        with open(path, "rb") as fp:
+            return memoryview(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
+
+    stamp = _file_stamp(path)
+    return _get_stamped(("file", str(path)), stamp, create, store)
+
+
+def load_file_text(path: Path, store: Cache = cache) -> str:
+    """Return a file content decoded as UTF-8, cached in `store` by path and mtime"""
+    stamp = _file_stamp(path)
+    return _get_stamped(
+        ("file_text", str(path)),
+        stamp,
+        lambda: str(load_file(path, store), "utf-8"),
+        store,
+    )
+
+
+# process: !array
+@dispatch
+def render_node(node: SequenceNode, tag: ArrayTag, *, path=None, dump=False, **ctx):
+    """[!array] Render a numeric sequence as a compact array, parsed in a single pass.
+
+    Use `!array:<type>` with types `f4`, `f8` (default), `i4` or `i8`. Returns a
+    NumPy array if NumPy is installed, or an `array.array` otherwise.
+
+    Examples:
+        buckets: !array:f8 [0.1, 0.5, 1.0, 5.0]
+    """
+
+    if dump:
+        return node
+
+    kind = "f8"
+    for mod in _parse_modifiers_array(path):
+        if mod in ARRAY_TYPES:
+            kind = mod
+    typecode, dtype = ARRAY_TYPES[kind]
+
+    items = node.value
+    if not all(isinstance(item, ScalarNode) for item in items):
+        raise TagException(f"The !array tag requires a sequence of scalars: {node}")
+
+    convert = float if typecode in "fd" else int
+    values = None
+    if all(item.tag in ARRAY_NUMBER_TAGS for item in items):
+        try:
+            values = [convert(item.value) for item in items]
+        except ValueError:
+            # YAML specific syntax, eg. `.inf` or `0o17`
+            pass
+
+    if values is None:
+        # tagged or quoted items are consumed here, so they can't be deferred
+        ctx = eager_ctx(ctx)
+        values = [render_node(item, dump=dump, **ctx) for item in items]
+
+    try:
+        out = array(typecode, values)
+    except (TypeError, OverflowError, ValueError) as ex:
+        raise TagException(f"Invalid !array:{kind} items: {ex}") from ex
+
+    numpy = _get_numpy()
+    if numpy is not None:
+        return numpy.frombuffer(out, dtype=dtype)
+    return out
+
+
+def get_modifiers_array(path) -> List[str]:
+    """Return the `!array` modifiers, like `get_modifiers`, also accepting the element
+    types in `ARRAY_TYPES`"""
+    return list(_parse_modifiers_array(path))
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_modifiers_array(path) -> Tuple[str, ...]:
+    if not path:
+        return ()
+    mods = tuple(path.split(":"))
+    for mod in mods:
+        if mod not in ARRAY_TYPES and mod.split("=", 1)[0] not in VALID_MODIFIERS:
+            raise TagException(
+                f"Invalid !array type '{mod}', expected one of {tuple(ARRAY_TYPES)}"
+            )
+    return mods
+
+
+@functools.lru_cache(maxsize=None)
+def _get_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 ###
 # Utilities
 ###
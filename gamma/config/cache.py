@@ -1,15 +1,20 @@
 """Module declaring a cache utility for gamma.config"""
 
-from beartype.typing import Any, Mapping
+import threading
+
+from beartype.typing import Any, Callable, Mapping
 
 
 class Cache(Mapping):
     """
     A cache backed by a in-memory `dict`
+
+    Cache contents are process-local: pickling a `Cache` yields an empty one.
     """
 
     def __init__(self) -> None:
         self.store = dict()
+        self.lock = threading.RLock()
 
     def __getitem__(self, key) -> Any:
         return self.store.__getitem__(key)
@@ -23,6 +28,29 @@ class Cache(Mapping):
     def __len__(self) -> int:  # pragma: no cover
         return self.store.__len__()
 
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def get_or_create(self, key, factory: Callable[[], Any]) -> Any:
+        """Return the value for `key`, calling `factory()` to create it if missing.
+
+        Creation is serialized, so concurrent callers get the same value.
+        """
+        try:
+            return self.store[key]
+        except KeyError:
+            pass
+
+        with self.lock:
+            try:
+                return self.store[key]
+            except KeyError:
+                value = self.store[key] = factory()
+                return value
+
     def clear(self):
         """Clear cache contents"""
         return self.store.clear()
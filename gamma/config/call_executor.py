@@ -0,0 +1,150 @@
+"""Module implementing concurrent execution of `!call` nodes with deadlines.
+
+Calls run with a timeout are executed in a separate thread, so a stuck call fails with
+`CallTimeoutError` instead of blocking the render forever. When rendering with the
+`call_executor` option, `!call` nodes are submitted to the executor as they're found,
+rendered as `PendingCall` placeholders and replaced by their results at the end.
+"""
+
+import threading
+import time
+from concurrent import futures
+
+from beartype.typing import Any, Callable, List, Optional, Tuple
+
+from .render_context import Pending
+
+
+class CallTimeoutError(TimeoutError):
+    """Raised when a `!call` node doesn't finish before its deadline"""
+
+
+class DaemonThreadExecutor(futures.Executor):
+    """Executor running each call in a new daemon thread.
+
+    Unlike `ThreadPoolExecutor`, stuck calls never block the interpreter exit.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> futures.Future:
+        future = futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as ex:
+                future.set_exception(ex)
+            else:
+                future.set_result(result)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+
+default_executor = DaemonThreadExecutor()
+
+
+def get_call_executor(executor) -> Optional[futures.Executor]:
+    """Return the executor for the `call_executor` option. `True` means the default
+    `DaemonThreadExecutor`."""
+    if executor is True:
+        return default_executor
+    return executor or None
+
+
+def get_deadline(
+    timeout: Optional[float], deadline: Optional[float] = None
+) -> Optional[float]:
+    """Return the earliest of `deadline` and `timeout` seconds from now"""
+    if timeout is None:
+        return deadline
+    end = time.monotonic() + timeout
+    return end if deadline is None else min(end, deadline)
+
+
+class PendingCall(Pending):
+    """Placeholder for a `!call` result running in an executor"""
+
+    __slots__ = ["future", "source", "deadline"]
+
+    def __init__(self, future: futures.Future, source: str, deadline=None) -> None:
+        self.future = future
+        self.source = source
+        self.deadline = deadline
+
+    def result(self) -> Any:
+        """Wait for the call result.
+
+        Raise:
+            `CallTimeoutError` if the call doesn't finish before the deadline.
+        """
+        wait = None
+        if self.deadline is not None:
+            wait = max(0.0, self.deadline - time.monotonic())
+
+        try:
+            return self.future.result(wait)
+        except futures.TimeoutError:
+            self.future.cancel()
+            msg = f"'{self.source}' did not finish before its deadline"
+            raise CallTimeoutError(msg)
+
+
+def run_call(
+    func: Callable[[], Any],
+    source: str,
+    *,
+    timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+    executor: Optional[futures.Executor] = None,
+) -> Any:
+    """Run a `!call` function.
+
+    Args:
+        source: description of the call used in error messages.
+        timeout: seconds the call is allowed to take.
+        deadline: absolute `time.monotonic()` value the call must finish by.
+        executor: if provided, submit the call and return a `PendingCall`.
+    """
+
+    deadline = get_deadline(timeout, deadline)
+    if executor is not None:
+        return PendingCall(executor.submit(func), source, deadline)
+
+    if deadline is None:
+        return func()
+
+    return PendingCall(default_executor.submit(func), source, deadline).result()
+
+
+def resolve_calls(out: Any) -> Any:
+    """Replace `PendingCall` placeholders in a rendered `dict`/`list` tree with their
+    results.
+
+    If any call fails, the remaining ones are cancelled and the error is raised.
+    """
+
+    if isinstance(out, PendingCall):
+        return out.result()
+
+    pending: List[Tuple[Any, Any, PendingCall]] = []
+    stack = [out] if isinstance(out, (dict, list)) else []
+    while stack:
+        cur = stack.pop()
+        items = cur.items() if isinstance(cur, dict) else enumerate(cur)
+        for k, v in items:
+            if isinstance(v, PendingCall):
+                pending.append((cur, k, v))
+            elif isinstance(v, (dict, list)):
+                stack.append(v)
+
+    try:
+        for container, key, call in pending:
+            container[key] = call.result()
+    except BaseException:
+        for _, _, call in pending:
+            call.future.cancel()
+        raise
+
+    return out
@@ -1,15 +1,17 @@
 import collections
 import re
 from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 
-from beartype.typing import Any, Dict, Iterable, Optional
+from beartype.typing import Any, Dict, Iterable, List, Optional, Tuple
 from ruamel.yaml.nodes import MappingNode, Node, SequenceNode
 
 from gamma.config import dispatch
 from gamma.config.load import load_node
 
 from . import tags
+from .cache import Cache
 from .merge import merge_nodes
 from .rawnodes import get_entry, get_id, get_keys, get_values
 from .tags import Tag
@@ -35,6 +37,12 @@ class ConfigNode(collections.abc.Mapping):
         "_parent",
         "_dot_access",
         "_root_nodes",
+        "_version",
+        "_eager_compile",
+        "_cache",
+        "_config_roots",
+        "_entry_roots",
+        "_env_override_prefix",
     ]
 
     def __init__(
@@ -83,9 +91,10 @@ class ConfigNode(collections.abc.Mapping):
             raise AttributeError(key) from err
 
     def __call__(self, *args, **kwds):
+        key = getattr(self._key, "value", self._key)
         raise TypeError(
             "A ConfigNode object is not callable. Are you're trying to "
-            f"access the empty/undefined key '{self._key}'?"
+            f"access the empty/undefined key '{key}'?"
         )
 
     def __setattr__(self, name: str, value: Any) -> None:
@@ -120,6 +129,13 @@ class RootConfig(ConfigNode):
         [`push_entry`](api?id=push_entry).
 
     If `entry_key` is `None`, a dynamically generated entry key will be created.
+
+    Values derived from the entries are cached per root object, and dropped whenever
+    entries are pushed or removed.
+
+    When loaded by `get_config`, the config root folders and the folder each entry was
+    loaded from are kept in the object, so tags like `!path` don't need to find them
+    again.
     """
 
     def __init__(
@@ -127,7 +143,13 @@ class RootConfig(ConfigNode):
     ) -> None:
         meta = meta or {}
         self._root_nodes: Dict[str, MappingNode] = collections.OrderedDict()
+        self._version = 0
+        self._cache = Cache()
+        self._config_roots: Optional[List[Path]] = None
+        self._entry_roots: Dict[str, Path] = {}
         self._dot_access = meta.get("__enable_dot_access__", False)
+        self._eager_compile = meta.get("__eager_compile__", False)
+        self._env_override_prefix = meta.get("__env_override_prefix__")
         super().__init__(node=None, root=self, parent=None)
 
         if bool(entry_key) or bool(entry):
@@ -201,36 +223,65 @@ def push_entry(
     if entry_key in root._root_nodes:
         raise ValueError(f"Config file/entry named {entry_key} duplicated.")
 
+    if root._eager_compile:
+        from .precompile import precompile_entry
+
+        precompile_entry(entry_key, node)
+
     d = root._root_nodes
     d[entry_key] = node
 
     # sort by entry_key
     s = collections.OrderedDict(sorted(d.items(), key=lambda x: x[0]))
     root._root_nodes = s
+    _entries_changed(root)
 
 
 @dispatch
 def remove_entry(cfg: RootConfig, entry_key: str):
     """Remove an entry from the RootConfig object."""
     del cfg._root_nodes[entry_key]
+    _entries_changed(cfg)
+
+
+def _entries_changed(root: RootConfig) -> None:
+    """Bump the root version and drop cached values derived from its entries"""
+    root._version += 1
+    root._cache.clear()
 
 
 @dispatch
 def config_getitem(cfg: ConfigNode, key, **ctx):
     """Get an item from config by key."""
-    _key, _item = get_entry(cfg._node, key)
+    _key, _item = config_getentry(cfg, key)
     ctx = ctx.copy()
     ctx["key"] = _key
     return resolve_item(_item, **ctx)
 
 
 @dispatch
-def config_getitem(cfg: RootConfig, key, **ctx):
-    """Get an item from a root config by key.
+def config_getentry(cfg: ConfigNode, key) -> Tuple[Node, Node]:
+    """Get the raw (key, value) nodes entry from config by key."""
+    return get_entry(cfg._node, key)
+
+
+@dispatch
+def config_getentry(cfg: RootConfig, key) -> Tuple[Node, Node]:
+    """Get the raw (key, value) nodes entry from a root config by key.
 
     We find all entries matching the key and merge them dynamically using
-    `merge_nodes`.
+    `merge_nodes`. The result is cached until entries are pushed or removed.
     """
+    try:
+        cache_key = ("entry", get_id(key))
+        hash(cache_key)
+    except TypeError:
+        return _merge_entries(cfg, key)
+
+    return cfg._cache.get_or_create(cache_key, partial(_merge_entries, cfg, key))
+
+
+def _merge_entries(cfg: RootConfig, key) -> Tuple[Node, Node]:
     matches = []
     key: str
     node: Node
@@ -242,12 +293,10 @@ def config_getitem(cfg: RootConfig, key, **ctx):
             matches.append((subkey, subnode))
 
     if matches:
-        key, node = merge_nodes(matches)
+        return merge_nodes(matches)
     else:
         raise KeyError(key)
 
-    return resolve_item(node, key=key, **ctx)
-
 
 @dispatch
 def resolve_item(item: Node, **ctx):
@@ -255,7 +304,7 @@ def resolve_item(item: Node, **ctx):
 
     This method delegates to a more specific method dispatched on (Node, Tag) types
     """
-    tag = Tag[item.tag]()
+    tag = tags.parse_tag(item.tag).tag
     return resolve_item(item, tag, **ctx)
 
 
@@ -266,9 +315,9 @@ def resolve_item(item: Node, tag: Tag, **ctx):
     Fallback to rendering the node using `render_node`
     """
 
-    from .render import render_node
+    from .memo import render_memoized
 
-    return render_node(item, tag, **ctx)
+    return render_memoized(item, tag, **ctx)
 
 
 @dispatch
@@ -276,7 +325,7 @@ def resolve_item(item: MappingNode, tag: tags.Map, **ctx):
     """Wrap a plain `map` node as a child `ConfigNode` object"""
     cfg = ctx.get("config")
     root = cfg._root if cfg is not None else None
-    return ConfigNode(item, root=root, parent=cfg)
+    return ConfigNode(item, root=root, parent=cfg, key=ctx.get("key"))
 
 
 @dispatch
@@ -0,0 +1,289 @@
+"""Module implementing static analysis of references between config values.
+
+Dependencies are found from `!ref` paths and from statically detectable root config
+accesses like `c.foo.bar` or `c["foo"]` in `!expr`, `!j2` and `!call` sources.
+
+`c` accesses are found with a pattern, so they may be wrong (eg. a loop variable
+named `c`). They are only used to order renders, and only cycles made entirely of
+`!ref` dependencies are reported as errors.
+"""
+
+import re
+
+from beartype.typing import Any, Dict, List, Optional, Set, Tuple
+from ruamel.yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from gamma.config import dispatch
+
+from .confignode import RootConfig
+from .memo import copy_tree
+from .merge import merge_nodes
+from .render import MAP_TAG, SEQ_TAG, render_node
+from .render_context import RenderPass
+from .secrets import resolve_secrets
+from .tags import parse_tag
+
+Path = Tuple[Any, ...]
+Graph = Dict[Path, Set[Path]]
+
+C_ACCESS_PATTERN = re.compile(
+    r"(?<![\w.])c((?:\.[A-Za-z_]\w*|\[\s*(?:'[^']*'|\"[^\"]*\")\s*\])+)"
+)
+C_TOKEN_PATTERN = re.compile(r"\.([A-Za-z_]\w*)|\[\s*(?:'([^']*)'|\"([^\"]*)\")\s*\]")
+C_ACCESS_SCHEMES = ("!expr", "!j2", "!j2_secret", "!call")
+
+_MISSING = object()
+
+
+class ReferenceCycleError(Exception):
+    """Raised when config values reference each other in a cycle"""
+
+    def __init__(self, cycle: List[Path]) -> None:
+        self.cycle = cycle
+        chain = " -> ".join(format_path(p) for p in cycle)
+        super().__init__(f"Reference cycle detected: {chain}")
+
+
+def format_path(path: Path) -> str:
+    """Format a path tuple using the `!ref` dot notation"""
+    out = ""
+    for token in path:
+        if isinstance(token, int):
+            out += f"[{token}]"
+        else:
+            token = str(token)
+            if "." in token:
+                token = f"'{token}'"
+            out += f".{token}" if out else token
+    return out
+
+
+class _Tree:
+    """Flattened view of a merged config tree"""
+
+    def __init__(self, root: RootConfig) -> None:
+        _, node = merge_nodes(list(root._root_nodes.values()))
+        self.root = root
+        self.node = node
+        self.leaves: Dict[Path, Tuple[Node, Optional[Node]]] = {}
+        self.containers: Dict[Path, Node] = {}
+        self.children: Dict[Path, List[Path]] = {}
+
+        stack: List[Tuple[Path, Optional[Node], Node]] = [((), None, node)]
+        while stack:
+            path, key, node = stack.pop()
+            if path:
+                self.children.setdefault(path[:-1], []).append(path)
+
+            if node.tag == MAP_TAG and isinstance(node, MappingNode):
+                self.containers[path] = node
+                for subkey, subvalue in reversed(node.value):
+                    name = render_node(subkey, config=root)
+                    stack.append((path + (name,), subkey, subvalue))
+            elif node.tag == SEQ_TAG and isinstance(node, SequenceNode):
+                self.containers[path] = node
+                for i in reversed(range(len(node.value))):
+                    stack.append((path + (i,), key, node.value[i]))
+            else:
+                self.leaves[path] = (node, key)
+
+    def is_ref(self, path: Path) -> bool:
+        leaf = self.leaves.get(path)
+        return leaf is not None and leaf[0].tag == "!ref"
+
+    def subtree_leaves(self, path: Path) -> List[Path]:
+        out = []
+        stack = [path]
+        while stack:
+            cur = stack.pop()
+            if cur in self.leaves:
+                out.append(cur)
+            stack.extend(self.children.get(cur, []))
+        return out
+
+
+def _ref_target(node: ScalarNode) -> Path:
+    from .builtin_tags import parse_ref_path
+
+    return parse_ref_path(node.value)
+
+
+def _node_targets(node: Node, refs_only: bool = False) -> List[Path]:
+    """Return the paths referenced by a node and its children. With `refs_only`,
+    skip the `c` accesses in dynamic tags."""
+
+    out = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        scheme = parse_tag(node.tag).scheme
+        if isinstance(node, ScalarNode):
+            if scheme == "!ref":
+                out.append(_ref_target(node))
+            elif scheme in C_ACCESS_SCHEMES and not refs_only:
+                for match in C_ACCESS_PATTERN.finditer(node.value):
+                    tokens = C_TOKEN_PATTERN.findall(match.group(1))
+                    out.append(tuple(a or b or c for a, b, c in tokens))
+        elif isinstance(node, MappingNode):
+            for key, value in node.value:
+                stack.append(value)
+        elif isinstance(node, SequenceNode):
+            stack.extend(node.value)
+    return out
+
+
+def _resolve_target(tree: _Tree, target: Path) -> Tuple[Set[Path], bool]:
+    """Return the leaves a target path depends on, and whether it's a plain lookup
+    of an existing value"""
+
+    deps = set()
+    seen = set()
+    plain = True
+    while target not in seen:
+        seen.add(target)
+        if target in tree.leaves or target in tree.containers:
+            deps.update(tree.subtree_leaves(target))
+            return deps, plain
+
+        # find a leaf in the way, following references
+        plain = False
+        for i in range(len(target) - 1, 0, -1):
+            prefix = target[:i]
+            if prefix in tree.leaves:
+                deps.add(prefix)
+                if tree.is_ref(prefix):
+                    target = _ref_target(tree.leaves[prefix][0]) + target[i:]
+                    break
+                return deps, plain
+        else:
+            # missing path, will fail when rendering
+            return deps, plain
+
+    return deps, plain
+
+
+@dispatch
+def get_dependency_graph(cfg: RootConfig, refs_only: bool = False) -> Graph:
+    """Return a mapping of each leaf value path to the leaf paths it depends on.
+
+    Leaves are scalar or tagged nodes in the merged config tree.
+
+    Args:
+        refs_only: only include the dependencies from `!ref` paths, skipping the `c`
+            accesses in dynamic tags.
+    """
+    return _get_graph(_Tree(cfg), refs_only)
+
+
+def _get_graph(tree: _Tree, refs_only: bool = False) -> Graph:
+    graph = {}
+    for path, (node, _) in tree.leaves.items():
+        deps = set()
+        for target in _node_targets(node, refs_only):
+            deps.update(_resolve_target(tree, target)[0])
+        graph[path] = deps
+    return graph
+
+
+def topological_order(graph: Graph, strict: bool = True) -> List[Path]:
+    """Return the graph vertices sorted so dependencies come first.
+
+    Args:
+        strict: if false, dependencies closing a cycle are ignored instead.
+
+    Raise:
+        `ReferenceCycleError` with the full cycle path if one is found.
+    """
+
+    WHITE, GRAY, BLACK = 0, 1, 2
+    color = {path: WHITE for path in graph}
+    order = []
+
+    for start in graph:
+        if color[start] != WHITE:
+            continue
+
+        color[start] = GRAY
+        stack = [(start, iter(graph[start]))]
+        while stack:
+            path, deps = stack[-1]
+            for dep in deps:
+                if color.get(dep, BLACK) == WHITE:
+                    color[dep] = GRAY
+                    stack.append((dep, iter(graph[dep])))
+                    break
+                elif color.get(dep) == GRAY and strict:
+                    cycle = [p for p, _ in stack]
+                    first = cycle.index(dep)
+                    raise ReferenceCycleError(cycle[first:] + [dep])
+            else:
+                stack.pop()
+                color[path] = BLACK
+                order.append(path)
+
+    return order
+
+
+@dispatch
+def check_references(cfg: RootConfig) -> None:
+    """Check the config for cycles of `!ref` values.
+
+    Raise:
+        `ReferenceCycleError` with the full cycle path if one is found.
+    """
+    topological_order(get_dependency_graph(cfg, refs_only=True))
+
+
+@dispatch
+def render_ordered(cfg: RootConfig, **ctx) -> Any:
+    """Render the whole config like `to_dict`, computing each value exactly once.
+
+    Values are rendered in dependency order, and plain `!ref` values are copied from
+    the already rendered targets instead of rendering them again.
+
+    Raise:
+        `ReferenceCycleError` with the full cycle path if a `!ref` cycle is found.
+    """
+
+    ctx.setdefault("config", cfg)
+    ctx.setdefault("dump", False)
+    ctx.setdefault("recursive", True)
+    ctx.setdefault("render_pass", RenderPass())
+
+    tree = _Tree(cfg)
+    topological_order(_get_graph(tree, refs_only=True))
+    order = topological_order(_get_graph(tree), strict=False)
+
+    # build the output skeleton, keeping the original key order
+    slots = {}
+    for path in sorted(tree.containers, key=len):
+        node = tree.containers[path]
+        if node.tag == MAP_TAG:
+            out = dict.fromkeys(child[-1] for child in tree.children.get(path, []))
+        else:
+            out = [None] * len(node.value)
+
+        slots[path] = out
+        if path:
+            slots[path[:-1]][path[-1]] = out
+
+    for path in order:
+        node, key = tree.leaves[path]
+        value = _MISSING
+        if tree.is_ref(path):
+            target = _ref_target(node)
+            _, plain = _resolve_target(tree, target)
+            if plain:
+                value = slots.get(target, _MISSING)
+                if value is _MISSING:
+                    value = slots[target[:-1]][target[-1]]
+                value = copy_tree(value)
+
+        if value is _MISSING:
+            value = render_node(node, **{**ctx, "key": key})
+
+        if not path:
+            return resolve_secrets(value, ctx["render_pass"])
+        slots[path[:-1]][path[-1]] = value
+
+    return resolve_secrets(slots[()], ctx["render_pass"])
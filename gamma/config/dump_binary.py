@@ -0,0 +1,110 @@
+"""Module implementing a compact binary export of rendered config objects.
+
+The format is a header followed by one length-prefixed `marshal` record per
+top-level key, so the whole rendered config is never held in memory. `marshal` data
+is specific to the Python version, so it's meant for shipping config to subprocesses
+or executors running the same Python, not for long-term storage.
+
+Like `to_json`, values are rendered to plain data first and serialized with
+`marshal.dumps`, see `gamma.config.dump_json`.
+"""
+
+import marshal
+import struct
+import sys
+from io import BytesIO
+
+from beartype.typing import IO, Any, Iterator, Optional, Union
+
+from .confignode import ConfigNode
+from .dump_json import iter_export_items
+from .frozen import FrozenConfig
+
+BINARY_MAGIC = b"GCFG"
+BINARY_VERSION = 1
+
+_MAP, _VALUE = 0, 1
+_LENGTH = struct.Struct("<I")
+
+
+def _header() -> bytes:
+    return BINARY_MAGIC + bytes(
+        [BINARY_VERSION, marshal.version, *sys.version_info[:2]]
+    )
+
+
+def to_binary(
+    cfg: ConfigNode, stream: Optional[IO[bytes]] = None, **ctx
+) -> Optional[bytes]:
+    """Render a config object in a compact binary format, one top-level key at a
+    time. Load it back with `from_binary`.
+
+    Args:
+        stream: if provided, write to this binary file-like object instead of
+            returning `bytes`.
+
+    Keyword Args:
+        dump: if true, sensitive values (eg. `!env`) are not rendered and are
+            exported as their YAML source, like `!env MY_VAR`.
+        **ctx: any other `to_dict` option.
+    """
+
+    if stream is None:
+        with BytesIO() as out:
+            to_binary(cfg, out, **ctx)
+            return out.getvalue()
+
+    stream.write(_header())
+    first = True
+    for key, value in iter_export_items(cfg, **ctx):
+        if key is None:
+            _write_record(stream, _VALUE)
+            _write_record(stream, value)
+            return None
+        if first:
+            _write_record(stream, _MAP)
+            first = False
+        _write_record(stream, (key, value))
+
+    if first:
+        _write_record(stream, _MAP)
+    return None
+
+
+def _write_record(stream: IO[bytes], value: Any) -> None:
+    data = marshal.dumps(value)
+    stream.write(_LENGTH.pack(len(data)))
+    stream.write(data)
+
+
+def from_binary(src: Union[bytes, IO[bytes]]) -> Any:
+    """Load a config exported with `to_binary` as a read-only `FrozenConfig`
+
+    Raise:
+        `ValueError` if the data is not in the expected format, or was exported by a
+        different Python version.
+    """
+
+    data = src if isinstance(src, (bytes, bytearray, memoryview)) else src.read()
+    view = memoryview(data)
+
+    header = _header()
+    if view[: len(header)] != header:
+        raise ValueError(
+            "Invalid config binary data, or exported with a different Python version"
+        )
+
+    records = _iter_records(view, len(header))
+    if next(records) == _VALUE:
+        out = next(records)
+        return FrozenConfig(out) if isinstance(out, dict) else out
+    return FrozenConfig(dict(records))
+
+
+def _iter_records(view: memoryview, pos: int) -> Iterator[Any]:
+    end = len(view)
+    while pos < end:
+        (size,) = _LENGTH.unpack_from(view, pos)
+        start = pos + _LENGTH.size
+        pos = start + size
+        yield marshal.loads(view[start:pos])
@@ -1,9 +1,15 @@
+import time
+
 from ruamel.yaml.nodes import MappingNode, SequenceNode
 
 from gamma.config import dispatch
 from gamma.config.confignode import ConfigNode
 
+from .call_executor import get_call_executor, resolve_calls
+from .parallel import render_parallel
 from .render import render_node
+from .render_context import RenderPass
+from .secrets import resolve_secrets
 from .tags import Map, Seq
 
 
@@ -16,14 +22,51 @@ def _prepare_ctx(**ctx):
     if "config" not in ctx:
         ctx["config"] = get_config()
 
+    if "call_executor" in ctx:
+        ctx["call_executor"] = get_call_executor(ctx["call_executor"])
+
     return ctx
 
 
+def _render(node, *args, workers=None, pool="thread", **ctx):
+    """Call `render_node`, applying the parallelism and `!call` execution options"""
+    timeout = ctx.pop("call_timeout", None)
+    if timeout is not None:
+        ctx["call_deadline"] = time.monotonic() + timeout
+
+    # only the call starting the render pass resolves its pending secrets, so nested
+    # renders sharing the pass don't fetch them before all are collected
+    owner = "render_pass" not in ctx
+    if owner:
+        ctx["render_pass"] = RenderPass()
+
+    if workers is not None and workers > 1:
+        out = render_parallel(node, workers=workers, pool=pool, **ctx)
+    else:
+        out = render_node(node, *args, **ctx)
+    if ctx.get("call_executor") is not None:
+        out = resolve_calls(out)
+    if owner:
+        out = resolve_secrets(out, ctx["render_pass"])
+    return out
+
+
 @dispatch
 def to_dict(node, **ctx):
-    """Converts a node to a dictionary."""
+    """Converts a node to a dictionary.
+
+    Keyword Args:
+        workers: render the top-level keys in a pool with this many workers. The
+            output is the same as rendering serially.
+        pool: the kind of pool used with `workers`, `"thread"` (default) or
+            `"process"`. Process pools require the config to be pickable.
+        call_executor: run `!call` nodes concurrently in this `Executor`. Pass `True`
+            to run each call in its own daemon thread.
+        call_timeout: seconds all `!call` nodes must finish in, otherwise raise
+            `CallTimeoutError`. Per-node limits are set with `!call:timeout=<seconds>`.
+    """
     ctx = _prepare_ctx(**ctx)
-    return render_node(node, **ctx)
+    return _render(node, **ctx)
 
 
 @dispatch
@@ -31,18 +74,18 @@ def to_dict(node: ConfigNode, **ctx):
     """Converts a ConfigNode to a dictionary."""
     ctx.setdefault("config", node)
     ctx = _prepare_ctx(**ctx)
-    return render_node(node, **ctx)
+    return _render(node, **ctx)
 
 
 @dispatch
 def to_dict(node: MappingNode, **ctx):
     """Render MappingNodes as dict regardless of tag value"""
     ctx = _prepare_ctx(**ctx)
-    return render_node(node, Map(), **ctx)
+    return _render(node, Map(), **ctx)
 
 
 @dispatch
 def to_dict(node: SequenceNode, **ctx):
     """Render SequenceNodes as list regardless of tag value"""
     ctx = _prepare_ctx(**ctx)
-    return render_node(node, Seq(), **ctx)
+    return _render(node, Seq(), **ctx)
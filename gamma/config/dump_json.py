@@ -0,0 +1,176 @@
+"""Module implementing JSON export and loading of rendered config objects.
+
+Top-level keys are rendered and written one at a time, so the whole rendered config
+is not held in memory. Once a key has pending `!secret` values, it and the keys after
+it are held until the end of the render, so all secrets are fetched in one batch.
+
+Values are rendered with `to_dict` machinery and then serialized with `json.dumps`,
+instead of writing the node tree directly: tag handlers (and merges, memoization or
+deferred calls) only produce plain values through `render_node`, and the C
+serializers write those faster than a Python walk over the nodes would.
+"""
+
+import base64
+import functools
+import json
+import time
+from io import StringIO
+
+from beartype.typing import IO, Any, Iterator, Optional, Tuple, Union
+from ruamel.yaml.nodes import MappingNode, Node, ScalarNode
+
+from gamma.config import dispatch
+
+from .confignode import ConfigNode, RootConfig
+from .dump_dict import _prepare_ctx, _render
+from .frozen import FrozenConfig
+from .merge import merge_nodes
+from .render import MAP_TAG
+from .render_context import RenderPass
+from .secrets import resolve_secrets
+
+
+@dispatch
+def get_export_node(cfg: RootConfig) -> Node:
+    """Return the node rendered when exporting a config object"""
+    _, node = merge_nodes(list(cfg._root_nodes.values()))
+    return node
+
+
+@dispatch
+def get_export_node(cfg: ConfigNode) -> Node:
+    return cfg._node
+
+
+def iter_export_items(cfg: ConfigNode, **ctx) -> Iterator[Tuple[Any, Any]]:
+    """Render a config object like `to_dict`, yielding `(key, value)` pairs for each
+    top-level key. Values are converted to plain data with `plain_value`.
+
+    If the config object is not a plain map, yield a single `(None, value)` pair.
+
+    Secrets are fetched in a single batch, so items are held from the first one with
+    a `!secret` value until all keys are rendered.
+
+    Keyword Args:
+        dump: if true, sensitive values (eg. `!env`) are not rendered and are
+            exported as their YAML source, like `!env MY_VAR`.
+        **ctx: any other `to_dict` option.
+    """
+
+    ctx.setdefault("config", cfg)
+    ctx.setdefault("dump", False)
+    ctx = _prepare_ctx(**ctx)
+    render_pass = ctx["render_pass"] = RenderPass()
+    timeout = ctx.pop("call_timeout", None)
+    if timeout is not None:
+        ctx["call_deadline"] = time.monotonic() + timeout
+
+    node = get_export_node(cfg)
+    if not isinstance(node, MappingNode) or node.tag != MAP_TAG:
+        yield None, plain_value(resolve_secrets(_render(node, **ctx), render_pass))
+        return
+
+    held = []
+    for keynode, valuenode in node.value:
+        key = _render(keynode, **ctx)
+        value = _render(valuenode, **{**ctx, "key": keynode})
+        if held or render_pass.pending:
+            # keep the items with secrets, so they are fetched in a single batch
+            held.append([key, value])
+        else:
+            yield key, plain_value(value)
+
+    for key, value in resolve_secrets(held, render_pass):
+        yield key, plain_value(value)
+
+
+def plain_value(value: Any) -> Any:
+    """Convert a rendered value to plain `dict`, `list` and scalar values, in place.
+
+    Unrendered nodes are replaced by their YAML source, array-like values (eg. from
+    `!array`) by lists and binary data (eg. from `!file`) by `bytes`.
+    """
+
+    if not isinstance(value, (dict, list)):
+        return _plain_leaf(value)
+
+    stack = [value]
+    while stack:
+        cur = stack.pop()
+        items = cur.items() if isinstance(cur, dict) else enumerate(cur)
+        for k, v in items:
+            if isinstance(v, (dict, list)):
+                stack.append(v)
+            else:
+                cur[k] = _plain_leaf(v)
+    return value
+
+
+def _plain_leaf(value: Any) -> Any:
+    if isinstance(value, Node):
+        return _node_source(value)
+    elif isinstance(value, tuple):
+        return plain_value(list(value))
+    elif isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    elif hasattr(value, "tolist"):
+        return value.tolist()
+    return value
+
+
+def _node_source(node: Node) -> str:
+    if isinstance(node, ScalarNode):
+        return f"{node.tag} {node.value}"
+
+    from .dump_yaml import yaml_serialize
+
+    return yaml_serialize(node).strip()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_json(cfg: ConfigNode, stream: Optional[IO[str]] = None, **ctx) -> Optional[str]:
+    """Render a config object as JSON, one top-level key at a time.
+
+    Binary data (eg. from `!file`) is written as a base64 string.
+
+    Args:
+        stream: if provided, write to this file-like object instead of returning a
+            string.
+
+    Keyword Args:
+        dump: if true, sensitive values (eg. `!env`) are not rendered and are
+            exported as their YAML source, like `!env MY_VAR`.
+        **ctx: any other `to_dict` option.
+    """
+
+    if stream is None:
+        with StringIO() as out:
+            to_json(cfg, out, **ctx)
+            return out.getvalue()
+
+    dumps = functools.partial(json.dumps, default=_json_default)
+    first = True
+    for key, value in iter_export_items(cfg, **ctx):
+        if key is None:
+            stream.write(dumps(value))
+            return None
+
+        if not isinstance(key, str):
+            key = dumps(key)
+        stream.write("{" if first else ", ")
+        stream.write(f"{dumps(key)}: {dumps(value)}")
+        first = False
+
+    stream.write("{}" if first else "}")
+    return None
+
+
+def from_json(src: Union[str, bytes, IO]) -> Any:
+    """Load a config exported with `to_json` as a read-only `FrozenConfig`"""
+    data = json.loads(src) if isinstance(src, (str, bytes)) else json.load(src)
+    return FrozenConfig(data) if isinstance(data, dict) else data
@@ -1,6 +1,7 @@
 import copy
 from io import StringIO
 
+from beartype.typing import Iterator
 from ruamel.yaml import YAML
 from ruamel.yaml.nodes import MappingNode, ScalarNode, SequenceNode
 
@@ -9,90 +10,171 @@ from gamma.config import dispatch
 from .confignode import ConfigNode, RootConfig
 from .merge import merge_nodes
 from .rawnodes import as_node
-from .render import render_node
-from .tags import Tag
+from .render import MAP_TAG, render_node
+from .render_context import RenderPass
+from .tags import CORE_TAG_PREFIX, parse_tag
 
 
-def yaml_serialize(node):
+def yaml_serialize(node, stream=None):
+    """Serialize a node as YAML, writing to `stream` if given, or returning a string"""
+    yaml = YAML(typ="rt")
+    if stream is not None:
+        yaml.serialize(node, stream)
+        return None
+
     with StringIO() as stream:
-        yaml = YAML(typ="rt")
         yaml.serialize(node, stream)
         stream.seek(0)
         return stream.read()
 
 
 @dispatch
-def to_yaml(cfg: RootConfig, resolve_tags: bool):
+def to_yaml(cfg: RootConfig, resolve_tags: bool, *, stream=None):
     """Dump a config/node to the YAML representation.
 
     Args:
         resolve_tags: if True, will render tags, otherwise, dump tags unrendered.
+        stream: if provided, write to this file-like object one top-level key at a
+            time, instead of returning a string.
     """
 
+    if stream is not None:
+        return _write_chunks(iter_yaml(cfg, resolve_tags), stream)
+
     nodes = list(cfg._root_nodes.values())
     _, node = merge_nodes(nodes)
     if resolve_tags:
-        node = dump_node(node, config=cfg)
+        node = dump_node(node, config=cfg, render_pass=RenderPass())
     return yaml_serialize(node)
 
 
 @dispatch
-def to_yaml(cfg: ConfigNode, resolve_tags: bool):
+def to_yaml(cfg: ConfigNode, resolve_tags: bool, *, stream=None):
+    if stream is not None:
+        return _write_chunks(iter_yaml(cfg, resolve_tags), stream)
+
     node = cfg._node
     if resolve_tags:
-        node = dump_node(node, config=cfg)
+        node = dump_node(node, config=cfg, render_pass=RenderPass())
     return yaml_serialize(node)
 
 
 @dispatch
-def to_yaml(cfg: ConfigNode):
+def to_yaml(cfg: ConfigNode, *, stream=None):
     """Render a ConfigNode assuming default of `resolve_tags` = True"""
-    return to_yaml(cfg, True)
+    return to_yaml(cfg, True, stream=stream)
+
+
+def _write_chunks(chunks: Iterator[str], stream) -> None:
+    for chunk in chunks:
+        stream.write(chunk)
 
 
 @dispatch
-def dump_node(node: ScalarNode, *, config=None):
+def iter_yaml(cfg: RootConfig, resolve_tags: bool) -> Iterator[str]:
+    """Yield the YAML representation of a config/node in chunks, one per top-level
+    key, so the whole dumped config is never held in memory.
+
+    Args:
+        resolve_tags: if True, will render tags, otherwise, dump tags unrendered.
+    """
+
+    nodes = list(cfg._root_nodes.values())
+    _, node = merge_nodes(nodes)
+    return _iter_chunks(node, cfg, resolve_tags)
+
+
+@dispatch
+def iter_yaml(cfg: ConfigNode, resolve_tags: bool) -> Iterator[str]:
+    return _iter_chunks(cfg._node, cfg, resolve_tags)
+
+
+@dispatch
+def iter_yaml(cfg: ConfigNode) -> Iterator[str]:
+    """Yield YAML chunks assuming default of `resolve_tags` = True"""
+    return iter_yaml(cfg, True)
+
+
+def _iter_chunks(node, config, resolve_tags: bool) -> Iterator[str]:
+    render_pass = RenderPass()
+
+    # tagged or empty maps are dumped at once
+    if not isinstance(node, MappingNode) or node.tag != MAP_TAG or not node.value:
+        if resolve_tags:
+            node = dump_node(node, config=config, render_pass=render_pass)
+        yield yaml_serialize(node)
+        return
+
+    for item in node.value:
+        chunk = MappingNode(node.tag, [item], flow_style=False)
+        if resolve_tags:
+            chunk = dump_node(chunk, config=config, render_pass=render_pass)
+        yield yaml_serialize(chunk)
+
+
+@dispatch
+def dump_node(node: ScalarNode, *, config=None, render_pass=None):
     """Dump a `scalar` node as raw YAML node"""
-    tag: str = node.tag
-    if not tag.startswith("tag:yaml.org,2002:"):
-        tagobj = Tag[tag]()
-        val = render_node(node, tagobj, dump=True, config=config)
-        return as_node(val)
+    if not node.tag.startswith(CORE_TAG_PREFIX):
+        return _dump_tagged(node, config, render_pass)
     return node
 
 
 @dispatch
-def dump_node(node: SequenceNode, *, config=None):
+def dump_node(node: SequenceNode, *, config=None, render_pass=None):
     """Dump a `seq` node as raw YAML node"""
 
-    tag: str = node.tag
-
     # render if sequence itself is tagged
-    if not tag.startswith("tag:yaml.org,2002:"):
-        tagobj = Tag[tag]()
-        val = render_node(node, tagobj, dump=True, config=config)
-        return as_node(val)
-
-    # resolve recursively for each value
-    newvalue = [dump_node(v, config=config) for v in node.value]
-    node = copy.copy(node)
-    node.value = newvalue
-    return node
+    if not node.tag.startswith(CORE_TAG_PREFIX):
+        return _dump_tagged(node, config, render_pass)
+
+    return _dump_tree(node, config, render_pass)
 
 
 @dispatch
-def dump_node(node: MappingNode, *, config=None):
-    """Dump a `scalar` node as raw YAML node"""
-    tag: str = node.tag
+def dump_node(node: MappingNode, *, config=None, render_pass=None):
+    """Dump a `map` node as raw YAML node"""
 
-    # render if sequence itself is tagged
-    if not tag.startswith("tag:yaml.org,2002:"):
-        tagobj = Tag[tag]()
-        val = render_node(node, tagobj, dump=True, config=config)
-        return as_node(val)
-
-    # resolve recursively for each entry
-    newvalue = [(k, dump_node(v, config=config)) for (k, v) in node.value]
-    node = copy.copy(node)
-    node.value = newvalue
+    # render if mapping itself is tagged
+    if not node.tag.startswith(CORE_TAG_PREFIX):
+        return _dump_tagged(node, config, render_pass)
+
+    return _dump_tree(node, config, render_pass)
+
+
+def _dump_tagged(node, config, render_pass=None):
+    tagobj = parse_tag(node.tag).tag
+    val = render_node(node, tagobj, dump=True, config=config, render_pass=render_pass)
+    return as_node(val)
+
+
+def _dump_child(node, config, stack, render_pass=None):
+    """Dump a child node, deferring plain `map`/`seq` nodes to the stack"""
+    if not node.tag.startswith(CORE_TAG_PREFIX):
+        return _dump_tagged(node, config, render_pass)
+    elif isinstance(node, (MappingNode, SequenceNode)):
+        node = copy.copy(node)
+        stack.append(node)
     return node
+
+
+def _dump_tree(node, config, render_pass=None):
+    """Dump a plain `map`/`seq` node tree using an explicit stack.
+
+    Nodes are shallow copied, so the source tree is not modified.
+    """
+
+    root = copy.copy(node)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, MappingNode):
+            node.value = [
+                (k, _dump_child(v, config, stack, render_pass)) for (k, v) in node.value
+            ]
+        else:
+            node.value = [
+                _dump_child(v, config, stack, render_pass) for v in node.value
+            ]
+
+    return root
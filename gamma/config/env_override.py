@@ -0,0 +1,155 @@
+"""Module implementing the environment variable override layer.
+
+When the `__env_override_prefix__` meta option is set (eg. to `GAMMA__`), environment
+variables starting with the prefix are collected once into a single config entry,
+with precedence over regular entries. The variable name is split by `__` into the
+(lowercase) key path, so `GAMMA__DB__HOST=myhost` overrides the `db.host` key.
+"""
+
+import os
+
+from beartype.typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+from ruamel.yaml.nodes import MappingNode, ScalarNode
+
+from gamma.config import dispatch
+
+from .confignode import RootConfig, push_entry, remove_entry
+from .render import MAP_TAG, render_node
+from .tags import Tag
+
+EnvOverrideTag = Tag["!env_override"]
+
+ENV_OVERRIDE_ENTRY_KEY = "~-env-override"
+"""The entry key of the override layer, sorted after regular entries but before
+`config_context` entries"""
+
+ENV_OVERRIDE_SEP = "__"
+
+
+def _iter_env_override(
+    prefix: str, environ: Optional[Mapping[str, str]]
+) -> Iterator[Tuple[str, List[str]]]:
+    """Yield the `(name, keys)` of the variables starting with `prefix`, checking
+    their values can be parsed"""
+
+    from .builtin_tags import parse_env_value
+
+    environ = os.environ if environ is None else environ
+    for name in sorted(environ):
+        head, sep, path = name.partition(prefix)
+        if head or not sep:
+            continue
+        keys = [k.lower() for k in path.split(ENV_OVERRIDE_SEP) if k]
+        if not keys:
+            continue
+
+        try:
+            parse_env_value(environ[name])
+        except Exception as ex:
+            raise ValueError(
+                f"Invalid YAML value in environment variable '{name}': {ex}"
+            ) from ex
+        yield name, keys
+
+
+def build_env_override(
+    prefix: str, environ: Optional[Mapping[str, str]] = None
+) -> Dict[str, Any]:
+    """Return the override values from the environment variables starting with
+    `prefix`, as a nested dict. Values are parsed as YAML, like `!env`.
+
+    Raise:
+        `ValueError` naming the variable if a value is not valid YAML.
+    """
+
+    from .builtin_tags import parse_env_value
+
+    environ = os.environ if environ is None else environ
+    out: Dict[str, Any] = {}
+    for name, keys in _iter_env_override(prefix, environ):
+        cur = out
+        for key in keys[:-1]:
+            if not isinstance(cur.get(key), dict):
+                cur[key] = {}
+            cur = cur[key]
+        cur[keys[-1]] = parse_env_value(environ[name])
+
+    return out
+
+
+def build_env_override_node(
+    prefix: str, environ: Optional[Mapping[str, str]] = None
+) -> Optional[MappingNode]:
+    """Like `build_env_override`, but return the override layer as a node tree, or
+    `None` if there are no overrides.
+
+    Leaves are `!env_override:<VAR>` nodes holding the variable value when the layer
+    was built. They are dumped as `!env <VAR>`, so values are never dumped.
+    """
+
+    environ = os.environ if environ is None else environ
+    out: Dict[str, Any] = {}
+    for name, keys in _iter_env_override(prefix, environ):
+        cur = out
+        for key in keys[:-1]:
+            if not isinstance(cur.get(key), dict):
+                cur[key] = {}
+            cur = cur[key]
+        cur[keys[-1]] = ScalarNode(f"!env_override:{name}", environ[name])
+
+    return _as_map_node(out) if out else None
+
+
+def _as_map_node(data: Dict[str, Any]) -> MappingNode:
+    items = []
+    for key, value in data.items():
+        if isinstance(value, dict):
+            value = _as_map_node(value)
+        items.append((ScalarNode("tag:yaml.org,2002:str", key), value))
+    return MappingNode(MAP_TAG, items)
+
+
+@dispatch
+def render_node(
+    node: ScalarNode, tag: EnvOverrideTag, *, path=None, dump=False, **ctx
+) -> Any:
+    """[!env_override:<VAR>] A value of the environment override layer.
+
+    Parsed as YAML like `!env`, and dumped as `!env <VAR>`.
+    """
+
+    from .builtin_tags import parse_env_value
+
+    if dump:
+        return ScalarNode("!env", path)
+    return parse_env_value(node.value)
+
+
+def refresh_env_override(
+    cfg: Optional[RootConfig] = None, environ: Optional[Mapping[str, str]] = None
+) -> None:
+    """Rebuild the override layer from the environment.
+
+    The environment is only scanned on config load and on explicit calls to this
+    function.
+
+    Args:
+        cfg: the root config, defaults to the global config.
+        environ: the variables to scan, defaults to `os.environ`.
+    """
+
+    if cfg is None:
+        from .globalconfig import get_config
+
+        cfg = get_config()
+
+    prefix = cfg._env_override_prefix
+    if not prefix:
+        return
+
+    override = build_env_override_node(prefix, environ)
+    if ENV_OVERRIDE_ENTRY_KEY in cfg._root_nodes:
+        remove_entry(cfg, ENV_OVERRIDE_ENTRY_KEY)
+
+    if override is not None:
+        push_entry(cfg, ENV_OVERRIDE_ENTRY_KEY, override, _allow_unsafe=True)
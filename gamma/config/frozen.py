@@ -0,0 +1,63 @@
+"""Module implementing `FrozenConfig`, a read-only view over exported config data"""
+
+import copy
+
+from beartype.typing import Any, Iterator, Mapping
+
+from gamma.config import dispatch
+
+from .dump_dict import to_dict
+
+
+class FrozenConfig(Mapping):
+    """A read-only view over rendered config data, like the output of `to_dict`.
+
+    Nested maps are returned as `FrozenConfig` objects and sequences as tuples. Use
+    `to_dict` to get a mutable copy.
+    """
+
+    __slots__ = ["_data", "_children"]
+
+    def __init__(self, data: Mapping) -> None:
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_children", {})
+
+    def __getitem__(self, key) -> Any:
+        value = self._data[key]
+        if not isinstance(value, (dict, list)):
+            return value
+
+        # nested maps and sequences are wrapped once
+        try:
+            return self._children[key]
+        except KeyError:
+            return self._children.setdefault(key, _freeze(value))
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise TypeError(f"'{self.__class__.__name__}' object is read-only")
+
+    def __reduce__(self):
+        return (FrozenConfig, (self._data,))
+
+    def __repr__(self) -> str:
+        return f"FrozenConfig({self._data!r})"
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenConfig(value)
+    elif isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dispatch
+def to_dict(node: FrozenConfig, **ctx):
+    """Return a mutable copy of the FrozenConfig data"""
+    return copy.deepcopy(node._data)
@@ -2,13 +2,17 @@
 
 import multiprocessing
 import threading
+from pathlib import Path
 
-from beartype.typing import Optional, Tuple
+from beartype.typing import List, Optional, Tuple
 
 from .cache import cache
 from .confignode import RootConfig, push_entry
-from .findconfig import get_entries, load_meta
+from .depgraph import check_references
+from .env_override import refresh_env_override
+from .findconfig import get_config_roots, get_entries, load_meta
 from .load import load_node
+from .memo import memo
 
 
 class _GlobalStore:
@@ -90,18 +94,38 @@ def get_config(initialize: bool = True) -> Optional[RootConfig]:
     if _global_store.empty() and not initialize:
         return None
     elif _global_store.empty() and initialize:
-        meta = load_meta()
+        config_roots = get_config_roots()
+        meta = load_meta(config_roots)
         entries = sorted(get_entries())
         root = RootConfig(meta=meta)
+        root._config_roots = config_roots
         for entry_key, entry in entries:
             node = load_node(entry)
             if node:
                 push_entry(root, entry_key, node)
+                entry_root = _find_entry_root(entry, config_roots)
+                if entry_root is not None:
+                    root._entry_roots[entry_key] = entry_root
+
+        refresh_env_override(root)
+
+        check_references(root)
 
         _global_store.set(root)
     return _global_store.get()
 
 
+def _find_entry_root(entry, config_roots: List[Path]) -> Optional[Path]:
+    """Return the config root folder containing an entry file"""
+    if not isinstance(entry, Path):
+        return None
+    entry = entry.absolute()
+    for config_root in config_roots:
+        if config_root in entry.parents:
+            return config_root
+    return None
+
+
 def reset_config(force: bool = False) -> None:
     """Clear the global store and cache.
 
@@ -115,6 +139,7 @@ def reset_config(force: bool = False) -> None:
 
     _global_store.reset(force=force)
     cache.clear()
+    memo.clear()
 
 
 def set_config(cfg: RootConfig) -> None:
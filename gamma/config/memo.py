@@ -0,0 +1,214 @@
+"""Module implementing memoization of rendered tag values.
+
+Memoization is enabled per node using the `cache` modifier, like `!call:cache` or
+`!j2:cache=60` for a 60 seconds TTL, or for every node of a tag using `memoize_tag`.
+
+Values are keyed by node identity, root config, root version and the render options
+changing the output, so pushing or removing entries never returns stale values.
+Returned `dict`/`list` containers are copies, but other objects are shared, don't
+mutate them.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from beartype.typing import Any, Callable, Dict, Optional, Tuple
+from ruamel.yaml.nodes import Node
+
+from .render_context import Pending
+from .tags import CORE_TAG_PREFIX, Tag, parse_tag
+
+MEMO_CACHE_SIZE = 1024
+
+_MISSING = object()
+
+MemoKey = Tuple[int, int, Optional[int], bool, bool]
+
+
+class MemoCache:
+    """A thread-safe LRU cache with per-entry TTL.
+
+    Entries keep a reference to their node, so a recycled `id()` is never a hit.
+    """
+
+    def __init__(self, maxsize: int = MEMO_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.store: "OrderedDict[MemoKey, Tuple[Node, Optional[float], Any]]"
+        self.store = OrderedDict()
+        self.lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def get(self, key: MemoKey, node: Node) -> Any:
+        """Return the value for `key`, or `_MISSING` if not found or expired"""
+        with self.lock:
+            entry = self.store.get(key)
+            if entry is None:
+                return _MISSING
+
+            entry_node, expires, value = entry
+            if entry_node is not node or (
+                expires is not None and expires <= time.monotonic()
+            ):
+                del self.store[key]
+                return _MISSING
+
+            self.store.move_to_end(key)
+            return value
+
+    def set(self, key: MemoKey, node: Node, value: Any, ttl: Optional[float]) -> None:
+        """Store a value, evicting the least recently used entries if full"""
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self.lock:
+            self.store[key] = (node, expires, value)
+            self.store.move_to_end(key)
+            while len(self.store) > self.maxsize:
+                self.store.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[MemoKey, Node], bool]) -> int:
+        """Remove the entries matching `predicate(key, node)`, returning the count"""
+        with self.lock:
+            keys = [k for k, (node, _, _) in self.store.items() if predicate(k, node)]
+            for key in keys:
+                del self.store[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self.lock:
+            self.store.clear()
+
+
+memo = MemoCache()
+
+_tag_ttls: Dict[str, Optional[float]] = {}
+
+
+def memoize_tag(tag: str, ttl: Optional[float] = None) -> None:
+    """Memoize every node rendered with `tag` (eg. `"!j2"`).
+
+    Args:
+        ttl: seconds a value is kept, or `None` to keep it until invalidated.
+    """
+    _tag_ttls[tag] = ttl
+
+
+def unmemoize_tag(tag: str) -> None:
+    """Stop memoizing nodes by tag, dropping their memoized values"""
+    _tag_ttls.pop(tag, None)
+    invalidate_memo(tag=tag)
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_memo_modifier(tag_name: str) -> Tuple[bool, Optional[float]]:
+    """Return whether a tag has a `cache[=<ttl>]` modifier, and the TTL"""
+    for mod in parse_tag(tag_name).modifiers:
+        name, sep, value = mod.partition("=")
+        if name == "cache":
+            return True, float(value) if sep else None
+    return False, None
+
+
+def get_memo_ttl(tag_name: str) -> Tuple[bool, Optional[float]]:
+    """Return whether nodes with this tag are memoized, and the TTL in seconds"""
+    enabled, ttl = _parse_memo_modifier(tag_name)
+    if enabled:
+        return True, ttl
+    scheme = parse_tag(tag_name).scheme
+    if scheme in _tag_ttls:
+        return True, _tag_ttls[scheme]
+    return False, None
+
+
+def _get_root(config):
+    return getattr(config, "_root", None)
+
+
+def render_memoized(node: Node, tag: Tag, **args) -> Any:
+    """Call `render_node(node, tag, **args)`, going through the memo if enabled"""
+
+    from .render import render_node
+
+    tag_name = node.tag
+    if tag_name.startswith(CORE_TAG_PREFIX):
+        return render_node(node, tag, **args)
+
+    enabled, ttl = get_memo_ttl(tag_name)
+    if not enabled:
+        return render_node(node, tag, **args)
+
+    root = _get_root(args.get("config"))
+    key = (
+        id(node),
+        id(root),
+        getattr(root, "_version", None),
+        bool(args.get("dump")),
+        bool(args.get("recursive")),
+    )
+    value = memo.get(key, node)
+    if value is _MISSING:
+        value = render_node(node, tag, **args)
+        if _is_memoizable(value):
+            memo.set(key, node, copy_tree(value), ttl)
+        return value
+    return copy_tree(value)
+
+
+def _is_memoizable(value: Any) -> bool:
+    if isinstance(value, (dict, list)):
+        # placeholders are only found by walking the tree, so skip the containers
+        return not _has_pending(value)
+    return not isinstance(value, Pending) and not inspect.isawaitable(value)
+
+
+def _has_pending(obj: Any) -> bool:
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        for v in cur.values() if isinstance(cur, dict) else cur:
+            if isinstance(v, (dict, list)):
+                stack.append(v)
+            elif isinstance(v, Pending) or inspect.isawaitable(v):
+                return True
+    return False
+
+
+def copy_tree(obj: Any) -> Any:
+    """Copy nested `dict`/`list` containers, sharing leaf values"""
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    root = type(obj)(obj)
+    stack = [root]
+    while stack:
+        cur = stack.pop()
+        items = cur.items() if isinstance(cur, dict) else enumerate(cur)
+        for k, v in list(items):
+            if isinstance(v, (dict, list)):
+                cur[k] = v = type(v)(v)
+                stack.append(v)
+    return root
+
+
+def invalidate_memo(config=None, tag: Optional[str] = None) -> int:
+    """Drop memoized values, returning how many were removed.
+
+    Args:
+        config: only drop values rendered for this config's root.
+        tag: only drop values for nodes with this tag scheme (eg. `"!j2"`).
+    """
+
+    root_id = id(_get_root(config)) if config is not None else None
+
+    def match(key: MemoKey, node: Node) -> bool:
+        if root_id is not None and key[1] != root_id:
+            return False
+        if tag is not None and parse_tag(node.tag).scheme != tag:
+            return False
+        return True
+
+    return memo.invalidate(match)
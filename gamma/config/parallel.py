@@ -0,0 +1,104 @@
+"""Module implementing parallel rendering of top-level config keys"""
+
+import pickle
+import warnings
+from concurrent import futures
+
+from beartype.typing import Any, Dict, Optional
+from ruamel.yaml.nodes import MappingNode, Node
+
+from .render import MAP_TAG, render_node
+from .render_context import RenderPass
+from .secrets import resolve_secrets
+
+POOLS = ("thread", "process")
+
+
+def _render_item(node: Node, args: Dict[str, Any]) -> Any:
+    return render_node(node, **args)
+
+
+_worker_ctx: Dict[str, Any] = {}
+
+
+def _init_process_worker(ctx_data: bytes) -> None:
+    # the render context is sent once per worker, instead of once per task
+    _worker_ctx.clear()
+    _worker_ctx.update(pickle.loads(ctx_data))
+
+
+def _render_item_process(node: Node, key: Node) -> Any:
+    # the render pass is not shared with the parent process
+    args = {**_worker_ctx, "key": key, "render_pass": RenderPass()}
+    return resolve_secrets(render_node(node, **args), args["render_pass"])
+
+
+def render_parallel(source, *, workers: int, pool: str = "thread", **ctx) -> Any:
+    """Render a node like `render_node`, splitting the top-level keys of a plain map
+    across `workers` threads or processes.
+
+    Keys are rendered serially and values are merged back in key order, so the output
+    is the same as the serial render.
+
+    Args:
+        workers: the pool size.
+        pool: `"thread"` or `"process"`. Process pools require the config and render
+            context to be pickable, otherwise a thread pool is used instead.
+    """
+
+    from .render_plan import _plan_node
+
+    if pool not in POOLS:
+        raise ValueError(f"Invalid pool '{pool}', expected one of {POOLS}")
+
+    node = _plan_node(source)
+    if node.tag != MAP_TAG or not isinstance(node, MappingNode):
+        return render_node(node, **ctx)
+
+    keys = []
+    tasks = []
+    for subkeynode, subvaluenode in node.value:
+        keys.append(render_node(subkeynode, **ctx))
+        tasks.append((subvaluenode, subkeynode))
+    if not tasks:
+        return {}
+
+    ctx_data = None
+    if pool == "process":
+        ctx_data = _pickle_ctx(ctx)
+        if ctx_data is None:
+            pool = "thread"
+
+    if pool == "thread":
+        with futures.ThreadPoolExecutor(workers) as executor:
+            items = [(value, {**ctx, "key": key}) for value, key in tasks]
+            return dict(zip(keys, executor.map(_render_item, *zip(*items))))
+
+    with futures.ProcessPoolExecutor(
+        workers, initializer=_init_process_worker, initargs=(ctx_data,)
+    ) as executor:
+        values = list(executor.map(_render_item_process, *zip(*tasks)))
+    return dict(zip(keys, values))
+
+
+def _pickle_ctx(ctx: Dict[str, Any]) -> Optional[bytes]:
+    """Pickle the render context for process workers, or return `None` with a
+    warning if it can't be used in other processes (eg. with `call_executor`)."""
+
+    reason = None
+    if ctx.get("call_executor") is not None:
+        # pending calls can't be sent back from the workers
+        reason = "`call_executor` is set"
+    else:
+        ctx = {k: v for k, v in ctx.items() if k != "render_pass"}
+        try:
+            return pickle.dumps(ctx)
+        except Exception as ex:
+            reason = f"the render context is not pickable: {ex}"
+
+    warnings.warn(
+        f"Using a thread pool instead of processes, {reason}",
+        RuntimeWarning,
+        stacklevel=3,
+    )
+    return None
@@ -0,0 +1,55 @@
+"""Module implementing the optional eager compile pass over loaded entries.
+
+Enabled by setting `__eager_compile__: true` in the `XX-meta.yaml` file. When enabled,
+tagged nodes are compiled (and validated) as entries are pushed to the root config,
+instead of on first render.
+"""
+
+from ruamel.yaml.nodes import MappingNode, Node, SequenceNode
+
+from gamma.config import dispatch
+
+from .tags import CORE_TAG_PREFIX, Tag, parse_tag
+
+
+@dispatch
+def precompile_node(node: Node, tag: Tag) -> None:
+    """Spec for tag precompile functions. By default, do nothing.
+
+    Like `render_node`, URI-style tags fallback to dispatching on the "scheme" part.
+    Implementations should raise an exception if the node is invalid.
+    """
+
+    info = parse_tag(tag.name)
+    if info.path is not None:
+        return precompile_node(node, info.scheme_tag)
+
+
+def precompile_entry(entry_key: str, node: Node) -> None:
+    """Call `precompile_node` on every tagged node in an entry tree.
+
+    Raise:
+        `ValueError` pointing to the entry and offending node if compilation fails.
+    """
+
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        tag = node.tag
+        if not tag.startswith(CORE_TAG_PREFIX):
+            try:
+                precompile_node(node, parse_tag(tag).tag)
+            except Exception as ex:
+                where = f"entry '{entry_key}'"
+                if node.start_mark is not None:
+                    where += f", line {node.start_mark.line + 1}"
+                raise ValueError(
+                    f"Error compiling '{tag}' node in {where}: {ex}"
+                ) from ex
+
+        if isinstance(node, MappingNode):
+            for key, value in node.value:
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(node, SequenceNode):
+            stack.extend(node.value)
@@ -1,7 +1,8 @@
 """Module implementing convenience methods for dealing with `ruamel.yaml` `Node`s"""
+import base64
 from collections.abc import Hashable
 
-from beartype.typing import Any, Iterable, Mapping, Optional, Tuple
+from beartype.typing import Any, Iterable, Mapping, Optional, Tuple, Union
 from ruamel.yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
 
 from gamma.config import dispatch
@@ -150,6 +151,13 @@ def as_node(a: str) -> Node:
     return ScalarNode("tag:yaml.org,2002:str", value=a)
 
 
+@dispatch
+def as_node(a: Union[bytes, bytearray, memoryview]) -> Node:
+    """Binary data is represented as a base64 `!!binary` scalar"""
+    value = base64.b64encode(a).decode("ascii")
+    return ScalarNode("tag:yaml.org,2002:binary", value=value)
+
+
 @dispatch
 def as_node(a: Mapping) -> Node:
     return MappingNode(
@@ -220,3 +228,21 @@ def union_nodes(first: Iterable, second: Iterable) -> Iterable:
             out[get_id(b)] = b
 
     return list(out.values())
+
+
+def is_static(node: Node) -> bool:
+    """Return `True` if the node and its children only have core YAML tags, ie. it
+    renders to the same value every time."""
+
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if not node.tag.startswith(tags.CORE_TAG_PREFIX):
+            return False
+        if isinstance(node, MappingNode):
+            for key, value in node.value:
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(node, SequenceNode):
+            stack.extend(node.value)
+    return True
@@ -9,10 +9,13 @@ from gamma.config import dispatch
 from gamma.config.confignode import ConfigNode, RootConfig  # noqa
 
 from . import tags
-from .rawnodes import get_entries, get_values
+from .memo import render_memoized
 
 logger = logging.getLogger(__name__)
 
+MAP_TAG = tags.Map().name
+SEQ_TAG = tags.Seq().name
+
 
 class RenderDispatchError(Exception):
     pass
@@ -28,6 +31,7 @@ def render_node(
     dump: bool = False,
     recursive: bool = False,
     path: Optional[str] = None,
+    **ctx,
 ):
     """Spec for tag handling functions.
 
@@ -61,17 +65,24 @@ def render_node(
             destination, so sensitive data should not be returned.
         recursive: If true, tag handlers should recursively render nodes.
         path: The URI path for URI fallback dispatch
+        **ctx: Extra render options (eg. `call_executor`), forwarded as is.
 
     Return:
         any value
     """
 
-    if ":" in tag.name:
+    info = tags.parse_tag(tag.name)
+    if info.path is not None:
         # try scheme based dispatch
-        scheme, path = tag.name.split(":", 1)
-        SchemeTag = tags.Tag[scheme]
         return render_node(
-            node, SchemeTag(), key=key, config=config, dump=dump, path=path
+            node,
+            info.scheme_tag,
+            key=key,
+            config=config,
+            dump=dump,
+            recursive=recursive,
+            path=info.path,
+            **ctx,
         )
 
     # not found errror
@@ -91,8 +102,7 @@ def render_node(node: Node, **args) -> Any:
     `render_node(Node, Tag)`
     """
 
-    TagClass = tags.Tag[node.tag]
-    return render_node(node, TagClass(), **args)
+    return render_memoized(node, tags.parse_tag(node.tag).tag, **args)
 
 
 @dispatch
@@ -155,29 +165,59 @@ def render_node(node: ScalarNode, tag: tags.Timestamp, **args):
 @dispatch
 def render_node(node: SequenceNode, tag: tags.Seq, **args):
     """Render `seq` nodes recursively"""
-    subargs = args.copy()
-
-    out = []
-    for subvaluenode in get_values(node):
-        subvalue = render_node(subvaluenode, **subargs)
-        out.append(subvalue)
-
-    return out
+    return _render_tree(node, args)
 
 
 @dispatch
 def render_node(node: MappingNode, tag: tags.Map, **args):
     """Render `map` nodes recursively"""
-    subargs = args.copy()
+    return _render_tree(node, args)
 
-    out = {}
-    for subkeynode, subvaluenode in get_entries(node):
-        subkey = render_node(subkeynode, **args)
-        subargs["key"] = subkeynode
-        subvalue = render_node(subvaluenode, **subargs)
-        out[subkey] = subvalue
 
-    return out
+def _new_container(node: Node):
+    """Return an empty output container if `node` is a plain `map` or `seq` node"""
+    tag = node.tag
+    if tag == MAP_TAG and isinstance(node, MappingNode):
+        return {}
+    elif tag == SEQ_TAG and isinstance(node, SequenceNode):
+        return []
+    return None
+
+
+def _render_tree(node: Node, args: dict):
+    """Render a plain `map`/`seq` node tree using an explicit stack.
+
+    Nested plain containers are handled inline, so arbitrarily deep trees don't hit
+    the recursion limit. Any other node (scalars, tagged nodes) is rendered by
+    dispatching to `render_node` as usual.
+    """
+
+    root = {} if isinstance(node, MappingNode) else []
+    stack = [(node, args, root)]
+    while stack:
+        node, args, out = stack.pop()
+
+        if isinstance(node, MappingNode):
+            subargs = args.copy()
+            for subkeynode, subvaluenode in node.value:
+                subkey = render_node(subkeynode, **args)
+                subargs["key"] = subkeynode
+                sub = _new_container(subvaluenode)
+                if sub is None:
+                    out[subkey] = render_node(subvaluenode, **subargs)
+                else:
+                    out[subkey] = sub
+                    stack.append((subvaluenode, subargs.copy(), sub))
+        else:
+            for subvaluenode in node.value:
+                sub = _new_container(subvaluenode)
+                if sub is None:
+                    out.append(render_node(subvaluenode, **args))
+                else:
+                    out.append(sub)
+                    stack.append((subvaluenode, args, sub))
+
+    return root
 
 
 @dispatch
@@ -1,7 +1,19 @@
 """Module handling rendering context variables (eg. for !expr and !j2)"""
-from functools import partial
-
-from beartype.typing import Any, Callable, List, NamedTuple, Optional, Union
+from functools import lru_cache, partial
+from types import CodeType
+
+from beartype.typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from gamma.config.confignode import ConfigNode
 
@@ -28,7 +40,78 @@ class ContextVar(NamedTuple):
     """If True, will cache the function result, otherwise will call on each render."""
 
 
-def get_render_context(**kwargs):
+class Pending:
+    """Base class for placeholders rendered instead of a value, which are replaced by
+    the actual value after rendering"""
+
+    __slots__ = []
+
+
+DEFERRED_CTX = ("call_executor", "render_pass")
+"""Render options making tags return `Pending` placeholders"""
+
+
+def eager_ctx(ctx: dict) -> dict:
+    """Return a copy of a render context without the options deferring values to the
+    end of the render (see `DEFERRED_CTX`).
+
+    Tags consuming the rendered values of their child nodes, instead of returning
+    them, should render the children with this context so they never get `Pending`
+    placeholders.
+    """
+    return {k: v for k, v in ctx.items() if k not in DEFERRED_CTX}
+
+
+class RenderPass:
+    """State shared by all tag renders of a single `to_dict`/`to_yaml` call.
+
+    Passed to `render_node` as the `render_pass` keyword argument. It memoizes, per
+    config node, the variables built by context providers marked with
+    `provider.per_config = True` and the values of those variables, so sibling leaves
+    don't build the same render context over and over.
+
+    Tags may also defer work to the end of the pass (eg. batching secret lookups) by
+    rendering placeholders and adding them to `pending`.
+    """
+
+    __slots__ = ["vars", "values", "pending"]
+
+    def __init__(self) -> None:
+        self.vars: Dict[Tuple[Callable, int], Tuple[Any, List[ContextVar]]] = {}
+        self.values: Dict[Tuple[Callable, int, str], Tuple[Any, Any]] = {}
+        self.pending: List[Any] = []
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def get_vars(self, provider: Callable, kwargs: dict) -> List[ContextVar]:
+        """Return the provider variables for `kwargs["config"]`"""
+        config = kwargs.get("config")
+        key = (provider, id(config))
+        entry = self.vars.get(key)
+        if entry is None or entry[0] is not config:
+            kwargs = {k: v for k, v in kwargs.items() if k != "names"}
+            entry = self.vars[key] = (config, provider(**kwargs))
+        return entry[1]
+
+    def get_value(self, provider: Callable, config, var: ContextVar) -> Any:
+        """Return the value of a provider variable for `config`"""
+        key = (provider, id(config), var.name)
+        entry = self.values.get(key)
+        if entry is None or entry[0] is not config:
+            entry = self.values[key] = (config, _get_var_value(var))
+        return entry[1]
+
+
+def get_render_context(
+    *,
+    names: Optional[Collection[str]] = None,
+    render_pass: Optional[RenderPass] = None,
+    **kwargs,
+):
     """Return the render context by calling each function in ``context_provider``.
 
     A context provider must be a function with the signature:
@@ -36,24 +119,46 @@ def get_render_context(**kwargs):
     or simply a list of `ContextVar` objects
 
     The provided `**kwargs` are the same available in the `render_node` function
+
+    Providers whose output only depends on the `config` kwarg can set the
+    `per_config = True` attribute, so their output is reused during a render pass.
+
+    Args:
+        names: if provided, only variables in this collection are resolved. It's also
+            passed to providers as the `names` kwarg, so they can skip building
+            variables that won't be used.
+        render_pass: the current `RenderPass`, if any.
     """
     out = {}
+    if names is not None:
+        if not names:
+            return out
+        kwargs["names"] = names
+
     for provider in context_providers:
         var: ContextVar
-        vars: List[ContextVar] = provider(**kwargs) if callable(provider) else provider
+        per_pass = render_pass is not None and getattr(provider, "per_config", False)
+        if per_pass:
+            vars = render_pass.get_vars(provider, kwargs)
+        else:
+            vars = provider(**kwargs) if callable(provider) else provider
+
         for var in vars:
+            if names is not None and var.name not in names:
+                continue
+
             if var.cacheable:
-                cache_key = f"render_context/{var.name}"
+                cache_key = ("render_context", var.name)
                 try:
                     out[var.name] = cache[cache_key]
                     continue
                 except KeyError:
                     pass
 
-            if var.function is not None:
-                val = var.function()
+            if per_pass:
+                val = render_pass.get_value(provider, kwargs.get("config"), var)
             else:
-                val = var.value
+                val = _get_var_value(var)
 
             if var.cacheable:
                 cache[cache_key] = val
@@ -63,6 +168,29 @@ def get_render_context(**kwargs):
     return out
 
 
+def _get_var_value(var: ContextVar) -> Any:
+    if var.function is not None:
+        return var.function()
+    return var.value
+
+
+@lru_cache(maxsize=1024)
+def get_code_names(code: CodeType) -> FrozenSet[str]:
+    """Return all global names a code object may reference, including nested code
+    objects (eg. lambdas and comprehensions).
+
+    Useful to compute the `names` argument of `get_render_context`
+    """
+
+    names = set()
+    stack = [code]
+    while stack:
+        code = stack.pop()
+        names.update(code.co_names)
+        stack.extend(c for c in code.co_consts if isinstance(c, CodeType))
+    return frozenset(names)
+
+
 ###
 # Built-in providers
 ###
@@ -84,15 +212,59 @@ def base_provider(**kwargs):
     ]
 
 
-def underscore_context_provider(*, config: ConfigNode = None, **kwargs):
-    """Look in parent config nodes and add all entries under the `_context` key"""
+base_provider.per_config = True
 
-    from .confignode import get_keys
-    from .render import render_node
+
+def underscore_context_provider(
+    *, config: ConfigNode = None, names: Optional[Collection[str]] = None, **kwargs
+):
+    """Look in parent config nodes and add all entries under the `_context` key"""
 
     if config is None:
         return []
 
+    context_vars = _get_context_vars(config)
+    if names is None:
+        return context_vars
+    return [var for var in context_vars if var.name in names]
+
+
+underscore_context_provider.per_config = True
+
+
+def _get_context_vars(config: ConfigNode) -> List[ContextVar]:
+    """Return the `_context` variables visible from a config node.
+
+    The result is cached in the root config by the chain of parent nodes, so it's
+    only discovered again when entries change.
+    """
+
+    root = config._root
+    if root is None:
+        return _find_context_vars(config)
+
+    chain = []
+    cur = config
+    while cur is not None:
+        chain.append(cur._node)
+        cur = cur._parent
+
+    key = ("context", tuple(map(id, chain)))
+    nodes, context_vars = root._cache.get_or_create(
+        key, lambda: (chain, _find_context_vars(config))
+    )
+    if len(nodes) != len(chain) or any(a is not b for a, b in zip(nodes, chain)):
+        # a node id was reused, refresh the entry
+        context_vars = _find_context_vars(config)
+        root._cache[key] = (chain, context_vars)
+
+    return context_vars
+
+
+def _find_context_vars(config: ConfigNode) -> List[ContextVar]:
+    from .confignode import get_keys
+    from .render import render_node
+
     out = {}
     parents = set([config._node])
 
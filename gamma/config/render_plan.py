@@ -0,0 +1,228 @@
+"""Module implementing precompiled render plans for repeated `to_dict` calls"""
+
+import copy
+from functools import partial
+
+from beartype.typing import Any, List, Optional, Tuple, Union
+from ruamel.yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from gamma.config import dispatch
+
+from . import tags
+from .call_executor import resolve_calls
+from .confignode import ConfigNode, RootConfig
+from .dump_dict import _prepare_ctx
+from .memo import render_memoized
+from .merge import merge_nodes
+from .render import render_node
+from .tags import CORE_TAG_PREFIX
+
+# plan opcodes
+OP_MAP = 0
+OP_SEQ = 1
+OP_CONST = 2
+OP_CALL = 3
+
+Op = Tuple[int, int, Any, Any]
+
+
+class RenderPlan:
+    """A flat list of operations that rebuilds the output of `to_dict` for a node.
+
+    Plain maps, sequences and core YAML scalars are rendered once when compiling, so
+    running the plan only evaluates the dynamic (tagged) nodes, using closures
+    prebound to the same context `to_dict` would use.
+
+    Each op is a tuple `(opcode, dst, key, arg)`, where `dst` is the slot of the
+    container receiving the value and `key` the mapping key (`None` to append).
+
+    Plans compiled from a `ConfigNode` are recompiled automatically when entries are
+    pushed to or removed from its `RootConfig`.
+    """
+
+    __slots__ = ["ops", "size", "_source", "_ctx", "_version"]
+
+    def __init__(self, source, **ctx) -> None:
+        self._source = source
+        self._ctx = ctx
+        self._version = None
+        self.ops: List[Op] = []
+        self.size = 0
+        self._compile()
+
+    def _root_version(self) -> Optional[int]:
+        if isinstance(self._source, ConfigNode) and self._source._root is not None:
+            return self._source._root._version
+        return None
+
+    def _compile(self) -> None:
+        if self._version is not None:
+            # child nodes keep the merged node from when they were created
+            source = self._source
+            self._source = _refresh_source(source)
+            if self._ctx.get("config") is source:
+                self._ctx["config"] = self._source
+        node = _plan_node(self._source)
+        self._version = self._root_version()
+        self.ops, self.size = compile_ops(node, **self._ctx)
+
+    def __call__(self) -> Any:
+        """Run the plan, returning a freshly built output object."""
+        if self._version != self._root_version():
+            self._compile()
+
+        slots = [None] * self.size
+        slots[0] = out = []
+        for op, dst, key, arg in self.ops:
+            if op == OP_CONST:
+                val = arg
+            elif op == OP_CALL:
+                val = arg()
+            elif op == OP_MAP:
+                val = slots[arg] = {}
+            else:
+                val = slots[arg] = []
+
+            if key is None:
+                slots[dst].append(val)
+            else:
+                slots[dst][key] = val
+
+        if self._ctx.get("call_executor") is not None:
+            return resolve_calls(out[0])
+        return out[0]
+
+
+def _refresh_source(source):
+    """Look up a child `ConfigNode` again from its root, by its parent and key.
+
+    Return `source` itself if it's not a child node or the path is not known.
+    """
+
+    if not isinstance(source, ConfigNode) or source is source._root:
+        return source
+
+    parent = source._parent
+    if parent is None or source._key is None:
+        return source
+
+    fresh_parent = _refresh_source(parent)
+    try:
+        fresh = fresh_parent[source._key]
+    except KeyError:
+        return source
+    return fresh if isinstance(fresh, ConfigNode) else source
+
+
+@dispatch
+def _plan_node(node: Node) -> Node:
+    return node
+
+
+@dispatch
+def _plan_node(node: Union[MappingNode, SequenceNode]) -> Node:
+    """Like `to_dict`, render raw map/seq nodes as containers regardless of tag"""
+    tag = tags.Map() if isinstance(node, MappingNode) else tags.Seq()
+    node = copy.copy(node)
+    node.tag = tag.name
+    return node
+
+
+@dispatch
+def _plan_node(cfg: ConfigNode) -> Node:
+    return cfg._node
+
+
+@dispatch
+def _plan_node(cfg: RootConfig) -> Node:
+    _, node = merge_nodes(list(cfg._root_nodes.values()))
+    return node
+
+
+def _is_static_key(node: Node) -> bool:
+    return isinstance(node, ScalarNode) and node.tag.startswith(CORE_TAG_PREFIX)
+
+
+def compile_ops(node: Node, **args) -> Tuple[List[Op], int]:
+    """Compile a node tree into a list of plan ops and the number of slots needed.
+
+    The tree is walked using an explicit stack, and entries are emitted in the same
+    order `render_node` would insert them.
+    """
+
+    ops: List[Op] = []
+    size = 1  # slot 0 holds the output
+    stack = [(node, 0, None, args)]
+    while stack:
+        node, dst, key, args = stack.pop()
+        tag = node.tag
+
+        if not tag.startswith(CORE_TAG_PREFIX):
+            tagobj = tags.parse_tag(tag).tag
+            ops.append(
+                (OP_CALL, dst, key, partial(render_memoized, node, tagobj, **args))
+            )
+
+        elif isinstance(node, ScalarNode):
+            ops.append((OP_CONST, dst, key, render_node(node, **args)))
+
+        elif isinstance(node, SequenceNode):
+            slot, size = size, size + 1
+            ops.append((OP_SEQ, dst, key, slot))
+            for subvaluenode in reversed(node.value):
+                stack.append((subvaluenode, slot, None, args))
+
+        elif isinstance(node, MappingNode) and all(
+            _is_static_key(k) for k, _ in node.value
+        ):
+            slot, size = size, size + 1
+            ops.append((OP_MAP, dst, key, slot))
+            children = []
+            for subkeynode, subvaluenode in node.value:
+                subargs = args.copy()
+                subargs["key"] = subkeynode
+                subkey = render_node(subkeynode, **args)
+                children.append((subvaluenode, slot, subkey, subargs))
+            stack.extend(reversed(children))
+
+        else:
+            # maps with dynamic keys are rendered as a whole
+            ops.append((OP_CALL, dst, key, partial(render_node, node, **args)))
+
+    return ops, size
+
+
+@dispatch
+def compile_plan(node, **ctx) -> RenderPlan:
+    """Compile a node into a `RenderPlan` that can be run repeatedly.
+
+    Accepts the same keyword arguments as `to_dict`. Calling the plan (or passing it
+    to `to_dict`) returns the same value as `to_dict(node, **ctx)`.
+    """
+    ctx = _prepare_ctx(**ctx)
+    _check_plan_ctx(ctx)
+    return RenderPlan(node, **ctx)
+
+
+@dispatch
+def compile_plan(node: ConfigNode, **ctx) -> RenderPlan:
+    """Compile a ConfigNode into a `RenderPlan`."""
+    ctx.setdefault("config", node)
+    ctx.setdefault("dump", False)
+    ctx = _prepare_ctx(**ctx)
+    _check_plan_ctx(ctx)
+    return RenderPlan(node, **ctx)
+
+
+def _check_plan_ctx(ctx: dict) -> None:
+    if "call_timeout" in ctx:
+        msg = "Plans don't support `call_timeout`, use `!call:timeout=<seconds>`"
+        raise ValueError(msg)
+
+
+@dispatch
+def to_dict(plan: RenderPlan, **ctx):
+    """Run a precompiled `RenderPlan`. The render context is bound when compiling."""
+    if ctx:
+        raise ValueError("Render context can only be set when compiling the plan")
+    return plan()
@@ -0,0 +1,202 @@
+"""Module implementing the `!secret:<backend>` tag and pluggable secret backends.
+
+During a render pass (eg. `to_dict`), secret leaves are rendered as `PendingSecret`
+placeholders and resolved at the end of the pass with a single batched call per
+backend. Fetched values are cached with a per backend TTL.
+"""
+
+import sqlite3
+import threading
+import time
+
+from beartype.typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from ruamel.yaml.nodes import ScalarNode
+
+from gamma.config import dispatch
+
+from .render import render_node
+from .render_context import Pending
+from .tags import Tag, TagException
+
+SecretTag = Tag["!secret"]
+
+DEFAULT_SECRET_TTL = 300.0
+SQLITE_BATCH_SIZE = 500
+
+
+class SecretBackend:
+    """Base class for secret backends.
+
+    Subclasses must implement `get_secrets`, fetching many keys in a single call.
+    """
+
+    ttl: Optional[float] = DEFAULT_SECRET_TTL
+    """Seconds fetched values are cached, `None` to cache until `clear_secrets`"""
+
+    def get_secrets(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Return a mapping with the values of the given keys. Missing keys should be
+        left out of the result."""
+        raise NotImplementedError()
+
+
+class SQLiteSecretBackend(SecretBackend):
+    """Backend reading secrets from a `(key, value)` table in a SQLite database.
+
+    Mostly useful for local development and tests.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "secrets",
+        ttl: Optional[float] = DEFAULT_SECRET_TTL,
+    ) -> None:
+        self.path = str(path)
+        self.table = table
+        self.ttl = ttl
+
+    def get_secrets(self, keys: Sequence[str]) -> Dict[str, Any]:
+        out = {}
+        with sqlite3.connect(self.path) as conn:
+            for i in range(0, len(keys), SQLITE_BATCH_SIZE):
+                end = i + SQLITE_BATCH_SIZE
+                batch = list(keys[i:end])
+                marks = ",".join("?" for _ in batch)
+                query = f'SELECT key, value FROM "{self.table}" WHERE key IN ({marks})'
+                out.update(conn.execute(query, batch).fetchall())
+        return out
+
+
+secret_backends: Dict[str, SecretBackend] = {}
+"""Registered secret backends, by name"""
+
+
+def register_secret_backend(name: str, backend: SecretBackend) -> None:
+    """Register a backend to be used as `!secret:<name>`"""
+    secret_backends[name] = backend
+    clear_secrets(name)
+
+
+def get_secret_backend(name: str) -> SecretBackend:
+    try:
+        return secret_backends[name]
+    except KeyError:
+        raise TagException(f"Secret backend '{name}' is not registered") from None
+
+
+_secrets_cache: Dict[Tuple[str, str], Tuple[Optional[float], Any]] = {}
+_secrets_lock = threading.Lock()
+
+
+def clear_secrets(backend: Optional[str] = None) -> None:
+    """Drop cached secret values, for all backends or only `backend`"""
+    with _secrets_lock:
+        for key in list(_secrets_cache):
+            if backend is None or key[0] == backend:
+                del _secrets_cache[key]
+
+
+def get_secrets(backend: str, keys: Iterable[str]) -> Dict[str, Any]:
+    """Return the values of `keys` from a backend, fetching the missing or expired
+    ones in a single batched call.
+
+    Raise:
+        `TagException` if any key is not found.
+    """
+
+    keys = list(dict.fromkeys(keys))
+    out = {}
+    now = time.monotonic()
+    with _secrets_lock:
+        for key in keys:
+            entry = _secrets_cache.get((backend, key))
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                out[key] = entry[1]
+
+    missing = [key for key in keys if key not in out]
+    if missing:
+        impl = get_secret_backend(backend)
+        fetched = impl.get_secrets(missing)
+        expires = None if impl.ttl is None else time.monotonic() + impl.ttl
+        with _secrets_lock:
+            for key in missing:
+                if key not in fetched:
+                    raise TagException(f"Secret '{key}' not found in '{backend}'")
+                _secrets_cache[(backend, key)] = (expires, fetched[key])
+                out[key] = fetched[key]
+
+    return out
+
+
+class PendingSecret(Pending):
+    """Placeholder for a secret to be fetched at the end of the render pass"""
+
+    __slots__ = ["backend", "key"]
+
+    def __init__(self, backend: str, key: str) -> None:
+        self.backend = backend
+        self.key = key
+
+
+@dispatch
+def render_node(
+    node: ScalarNode, tag: SecretTag, *, dump=False, path=None, render_pass=None, **ctx
+):
+    """[!secret:<backend>] Fetch the node value key from a secret backend.
+
+    Like `!env_secret`, the value is never dumped. Modifiers follow the backend name,
+    eg. `!secret:vault:cache`.
+    """
+
+    from .builtin_tags import _parse_modifiers
+
+    if dump:
+        return node
+
+    backend, _, modifiers = (path or "").partition(":")
+    if not backend:
+        raise TagException("The !secret tag requires a backend, eg. `!secret:vault`")
+    _parse_modifiers(modifiers or None)
+
+    if render_pass is not None:
+        get_secret_backend(backend)
+        pending = PendingSecret(backend, node.value)
+        render_pass.pending.append(pending)
+        return pending
+
+    return get_secrets(backend, [node.value])[node.value]
+
+
+def resolve_secrets(out: Any, render_pass) -> Any:
+    """Replace the `PendingSecret` placeholders of a render pass in the rendered tree,
+    with a single fetch per backend."""
+
+    if render_pass is None or not render_pass.pending:
+        return out
+
+    by_backend: Dict[str, List[str]] = {}
+    for pending in render_pass.pending:
+        by_backend.setdefault(pending.backend, []).append(pending.key)
+    render_pass.pending = []
+
+    values = {
+        backend: get_secrets(backend, keys) for backend, keys in by_backend.items()
+    }
+
+    def resolve(value):
+        return values[value.backend][value.key]
+
+    if isinstance(out, PendingSecret):
+        return resolve(out)
+
+    stack = [out] if isinstance(out, (dict, list)) else []
+    while stack:
+        cur = stack.pop()
+        items = cur.items() if isinstance(cur, dict) else enumerate(cur)
+        for k, v in items:
+            if isinstance(v, PendingSecret):
+                cur[k] = resolve(v)
+            elif isinstance(v, (dict, list)):
+                stack.append(v)
+
+    return out
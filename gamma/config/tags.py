@@ -1,6 +1,11 @@
 """Definition of base Tag class and standard YAML derived tag types"""
+from functools import lru_cache
+
+from beartype.typing import NamedTuple, Optional, Tuple
 from plum import parametric, type_parameter
 
+CORE_TAG_PREFIX = "tag:yaml.org,2002:"
+
 
 @parametric
 class Tag:
@@ -22,3 +27,38 @@ Merge = Tag["tag:yaml.org,2002:merge"]
 
 class TagException(Exception):
     pass
+
+
+class TagInfo(NamedTuple):
+    """A parsed tag string. URI-style tags like `!env:dump` have the `!env` scheme
+    and the `dump` path."""
+
+    name: str
+    """The full tag string"""
+
+    tag: Tag
+    """A `Tag` instance for the full tag string"""
+
+    scheme: str
+    """The tag scheme, the same as `name` if not an URI-style tag"""
+
+    path: Optional[str]
+    """The URI path, `None` if not an URI-style tag"""
+
+    modifiers: Tuple[str, ...]
+    """The path split by `:`"""
+
+    scheme_tag: Tag
+    """A `Tag` instance for the scheme"""
+
+
+@lru_cache(maxsize=None)
+def parse_tag(name: str) -> TagInfo:
+    """Parse a tag string into a `TagInfo`, interned per tag string"""
+    if name.startswith(CORE_TAG_PREFIX) or ":" not in name:
+        tag = Tag[name]()
+        return TagInfo(name, tag, name, None, (), tag)
+
+    scheme, path = name.split(":", 1)
+    modifiers = tuple(path.split(":"))
+    return TagInfo(name, Tag[name](), scheme, path, modifiers, Tag[scheme]())
@@ -0,0 +1,51 @@
+"""Benchmark config export: `to_dict` + `json.dumps` against `to_json` and
+`to_binary`, and loading the results back.
+
+Usage: python scripts/bench_export.py [n_keys]
+"""
+
+import json
+import sys
+import time
+
+from gamma.config import RootConfig, from_binary, from_json, to_binary, to_dict, to_json
+
+
+def make_config(n_keys: int) -> RootConfig:
+    lines = []
+    for i in range(n_keys):
+        lines.append(f"key_{i}:")
+        lines.append(f"  name: item {i}")
+        lines.append(f"  weight: {i * 0.5}")
+        lines.append("  tags: [a, b, c]")
+        lines.append(f"  nested: {{enabled: true, level: {i % 10}}}")
+        lines.append("  double: !expr 2 * 21")
+    return RootConfig("bench", "\n".join(lines))
+
+
+def bench(name, func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - start)
+    size = f"{len(out) / 1024:.0f} KiB" if isinstance(out, (str, bytes)) else ""
+    print(f"{name:<24} {best * 1000:>10.1f} ms  {size}")
+    return out
+
+
+def main():
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cfg = make_config(n_keys)
+    print(f"{n_keys} top-level keys")
+
+    content = bench("to_dict + json.dumps", lambda: json.dumps(to_dict(cfg)))
+    bench("to_json", lambda: to_json(cfg))
+    data = bench("to_binary", lambda: to_binary(cfg))
+    bench("json.loads", lambda: json.loads(content))
+    bench("from_json", lambda: from_json(content))
+    bench("from_binary", lambda: from_binary(data))
+
+
+if __name__ == "__main__":
+    main()
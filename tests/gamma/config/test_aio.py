@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+from ruamel.yaml.nodes import Node
+
+from gamma.config import ConfigNode, RootConfig, aget, ato_dict, dispatch, render_node
+from gamma.config.tags import Tag
+
+THREADS = []
+AsyncSleepTag = Tag["!async_sleep"]
+
+
+@dispatch
+async def render_node(node: Node, tag: AsyncSleepTag, **ctx):
+    await asyncio.sleep(0.3)
+    return f"slept {node.value}"
+
+
+def sync_call(value):
+    THREADS.append(threading.current_thread())
+    return value
+
+
+SRC = f"""
+a: !async_sleep a
+b:
+  c: !async_sleep c
+  d: [1, !async_sleep d]
+e: !call {__name__}:sync_call(1)
+"""
+
+
+def test_ato_dict():
+    cfg = RootConfig("dummy", SRC)
+
+    start = time.monotonic()
+    THREADS.clear()
+    out = asyncio.run(ato_dict(cfg))
+
+    # async leaves are gathered, sync handlers run in the executor
+    assert time.monotonic() - start < 0.8
+    assert THREADS[0] is not threading.main_thread()
+    assert out == {
+        "a": "slept a",
+        "b": {"c": "slept c", "d": [1, "slept d"]},
+        "e": 1,
+    }
+
+
+def test_aget():
+    cfg = RootConfig("dummy", SRC)
+
+    async def main():
+        return await asyncio.gather(
+            aget(cfg, "b.c"), aget(cfg, ["b", "d"]), aget(cfg, "e"), aget(cfg, "b")
+        )
+
+    c, d, e, b = asyncio.run(main())
+    assert c == "slept c"
+    assert d == [1, "slept d"]
+    assert e == 1
+    assert isinstance(b, ConfigNode)
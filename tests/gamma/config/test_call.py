@@ -1,5 +1,10 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import pytest
+
+from gamma.config.call_executor import CallTimeoutError
 from gamma.config.confignode import RootConfig
 
 SRC = """
@@ -18,3 +23,136 @@ def test_call(monkeypatch):
     assert cfg["t2"] == os.getuid()
     assert cfg["t3"] == os.path.join("foo", "bar")
     assert cfg["t4"] == os.path.join(os.path.join("a", "b"), "c")
+
+
+def append_one(items):
+    items.append(1)
+    return items
+
+
+def test_call_plan(monkeypatch):
+    from gamma.config import builtin_tags, reset_config
+
+    calls = []
+    resolve = builtin_tags._resolve_callable
+
+    def counting_resolve(fq_name):
+        calls.append(fq_name)
+        return resolve(fq_name)
+
+    monkeypatch.setattr(builtin_tags, "_resolve_callable", counting_resolve)
+    reset_config()
+
+    src = f"""
+    a: !call os.path:join('foo', 'bar')
+    b: !call
+        _func: {__name__}:append_one
+        items: []
+    """
+    cfg = RootConfig("dummy", src)
+
+    # resolved once, then only executed
+    for _ in range(3):
+        assert cfg["a"] == os.path.join("foo", "bar")
+        assert cfg["b"] == [1]
+    assert calls == ["os.path:join", f"{__name__}:append_one"]
+
+    # plans are dropped on reset
+    reset_config()
+    assert cfg["a"] == os.path.join("foo", "bar")
+    assert calls[-1] == "os.path:join"
+    assert len(calls) == 3
+
+    # mapping plans are kept per root config
+    from gamma.config.cache import cache
+
+    assert not any(k[0] == "call_map" for k in cache if isinstance(k, tuple))
+    assert any(k[0] == "call_map" for k in cfg._cache if isinstance(k, tuple))
+
+
+def sleep_and_return(value, seconds):
+    time.sleep(seconds)
+    return value
+
+
+def test_call_timeout():
+    from gamma.config import to_dict
+
+    src = f"""
+    fast: !call:timeout=5 {__name__}:sleep_and_return(1, 0)
+    slow: !call:timeout=0.1 {__name__}:sleep_and_return(2, 10)
+    """
+    cfg = RootConfig("dummy", src)
+    assert cfg["fast"] == 1
+
+    start = time.monotonic()
+    with pytest.raises(CallTimeoutError, match="sleep_and_return"):
+        cfg["slow"]
+    assert time.monotonic() - start < 5
+
+    # global deadline
+    src = f"""
+    a: !call {__name__}:sleep_and_return(1, 10)
+    """
+    cfg = RootConfig("dummy", src)
+    with pytest.raises(CallTimeoutError):
+        to_dict(cfg, call_timeout=0.1)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        self.calls += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_call_executor(monkeypatch):
+    from gamma.config import call_executor, to_dict
+
+    src = f"""
+    a: !call {__name__}:sleep_and_return(1, 0)
+    b:
+      - !call {__name__}:sleep_and_return(2, 0)
+      - !call
+          _func: {__name__}:sleep_and_return
+          value: 3
+          seconds: 0
+    c: !call:timeout=5 {__name__}:sleep_and_return(4, 0)
+    """
+    cfg = RootConfig("dummy", src)
+    expected = {"a": 1, "b": [2, 3], "c": 4}
+
+    # every call is submitted to the executor
+    with CountingExecutor(4) as pool:
+        assert to_dict(cfg, call_executor=pool) == expected
+        assert pool.calls == 4
+
+    with CountingExecutor(4) as pool:
+        monkeypatch.setattr(call_executor, "default_executor", pool)
+        assert to_dict(cfg, call_executor=True, call_timeout=5) == expected
+        assert pool.calls == 4
+    monkeypatch.undo()
+
+    src = f"a: !call {__name__}:sleep_and_return(1, 10)"
+    cfg = RootConfig("dummy", src)
+    with pytest.raises(CallTimeoutError):
+        to_dict(cfg, call_executor=True, call_timeout=0.1)
+
+
+def test_call_executor_consumed():
+    from gamma.config import to_dict
+
+    # tags consuming child values never get placeholders
+    src = f"""
+    a: !py:builtins:sorted
+      - !call {__name__}:sleep_and_return(3, 0)
+      - 1
+    """
+    cfg = RootConfig("dummy", src)
+    with CountingExecutor(2) as pool:
+        with pytest.warns(DeprecationWarning):
+            assert to_dict(cfg, call_executor=pool) == {"a": [1, 3]}
+        assert pool.calls == 0
@@ -0,0 +1,105 @@
+import pytest
+
+from gamma.config import RootConfig, get_config, to_dict
+from gamma.config.depgraph import (
+    ReferenceCycleError,
+    check_references,
+    get_dependency_graph,
+    render_ordered,
+)
+from gamma.config.globalconfig import set_config
+
+CALLS = []
+
+
+def count(val):
+    CALLS.append(val)
+    return val
+
+
+SRC = f"""
+a:
+  b: !call {__name__}:count(1)
+  c: [1, 2]
+d: !ref a.b
+e: !ref d
+f: !ref a
+g: !expr c['a']['b'] + 1
+h: !j2 "{{{{ c.a.b }}}}"
+"""
+
+
+def test_dependency_graph():
+    cfg = RootConfig("dummy", SRC)
+    graph = get_dependency_graph(cfg)
+
+    assert graph[("a", "b")] == set()
+    assert graph[("d",)] == {("a", "b")}
+    assert graph[("e",)] == {("d",)}
+    assert graph[("f",)] == {("a", "b"), ("a", "c", 0), ("a", "c", 1)}
+    assert graph[("g",)] == {("a", "b")}
+    assert graph[("h",)] == {("a", "b")}
+
+
+def test_render_ordered():
+    cfg = RootConfig("dummy", SRC)
+    set_config(cfg)
+
+    CALLS.clear()
+    expected = to_dict(cfg)
+    assert len(CALLS) == 6
+
+    CALLS.clear()
+    got = render_ordered(cfg)
+    assert got == expected
+    assert list(got) == list(expected)
+
+    # `!ref`s reuse the rendered target, `c` accesses still render it
+    assert len(CALLS) == 3
+
+    # referenced subtrees are copied
+    assert got["f"]["c"] is not got["a"]["c"]
+
+
+def test_cycles():
+    src = """
+    a: !ref b.c
+    b:
+      c: !ref d
+    d: !ref a
+    e: 1
+    """
+
+    cfg = RootConfig("dummy", src)
+    with pytest.raises(ReferenceCycleError, match="a -> b.c -> d -> a"):
+        check_references(cfg)
+
+    with pytest.raises(ReferenceCycleError):
+        render_ordered(cfg)
+
+
+def test_cycles_through_c_accesses():
+    # `c` accesses are a guess, so they are only used for ordering
+    src = """
+    _context:
+      items: [{name: foo}]
+    x: !expr "[c.x for c in []]"
+    y: !j2 "{% for c in items %}{{ c.name }}{% endfor %}"
+    """
+
+    cfg = RootConfig("dummy", src)
+    assert get_dependency_graph(cfg)[("x",)] == {("x",)}
+    check_references(cfg)
+    got = render_ordered(cfg)
+    assert got == to_dict(cfg)
+    assert got["x"] == [] and got["y"] == "foo"
+
+
+def test_cycles_on_load(monkeypatch, tmp_path):
+    meta = "include_folders: []"
+    (tmp_path / "00-meta.yaml").write_text(meta)
+    (tmp_path / "10-config.yaml").write_text("a: !ref b\nb: !ref a")
+    monkeypatch.setenv("GAMMA_CONFIG_ROOT", str(tmp_path))
+
+    with pytest.raises(ReferenceCycleError, match="a -> b -> a"):
+        get_config()
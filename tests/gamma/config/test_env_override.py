@@ -0,0 +1,88 @@
+from gamma.config import RootConfig, push_entry, refresh_env_override, to_dict
+from gamma.config.env_override import ENV_OVERRIDE_ENTRY_KEY, build_env_override
+
+
+def test_build_env_override():
+    environ = {
+        "GAMMA__DB__HOST": "myhost",
+        "GAMMA__DB__PORT": "5433",
+        "GAMMA__FLAGS": "[a, b]",
+        "GAMMA__DEBUG": "true",
+        "GAMMA__": "ignored",
+        "OTHER__DB__HOST": "ignored",
+    }
+
+    assert build_env_override("GAMMA__", environ) == {
+        "db": {"host": "myhost", "port": 5433},
+        "flags": ["a", "b"],
+        "debug": True,
+    }
+
+
+def test_env_override_layer():
+    cfg = RootConfig(meta={"__env_override_prefix__": "GAMMA__"})
+    push_entry(cfg, "10-base", "db: {host: localhost, port: 5432}\ndebug: false")
+
+    refresh_env_override(cfg, {"GAMMA__DB__HOST": "myhost", "GAMMA__NEW": "1"})
+    assert to_dict(cfg) == {
+        "db": {"host": "myhost", "port": 5432},
+        "debug": False,
+        "new": 1,
+    }
+
+    # applied after entries pushed later
+    push_entry(cfg, "zz-late", "db: {host: late}")
+    assert cfg["db"]["host"] == "myhost"
+
+    # rebuilt only on refresh
+    refresh_env_override(cfg, {"GAMMA__DEBUG": "true"})
+    assert cfg["debug"] is True
+    assert cfg["db"]["host"] == "late"
+
+    refresh_env_override(cfg, {})
+    assert ENV_OVERRIDE_ENTRY_KEY not in cfg._root_nodes
+    assert cfg["debug"] is False
+
+
+def test_env_override_disabled():
+    cfg = RootConfig("dummy", "a: 1")
+    refresh_env_override(cfg, {"GAMMA__A": "2"})
+    assert cfg["a"] == 1
+
+
+def test_env_override_context():
+    from gamma.config import config_context
+
+    cfg = RootConfig(meta={"__env_override_prefix__": "GAMMA__"})
+    push_entry(cfg, "10-base", "a: 1")
+    refresh_env_override(cfg, {"GAMMA__A": "2"})
+    assert cfg["a"] == 2
+
+    with config_context(cfg, {"a": 3}):
+        assert cfg["a"] == 3
+
+
+def test_env_override_dump():
+    import json
+
+    import pytest
+
+    from gamma.config import to_json, to_yaml
+
+    cfg = RootConfig(meta={"__env_override_prefix__": "GAMMA__"})
+    push_entry(cfg, "10-base", "db: {user: admin, password: !env DB_PASSWORD}")
+    refresh_env_override(cfg, {"GAMMA__DB__PASSWORD": "s3cret"})
+
+    assert cfg["db"]["password"] == "s3cret"
+    assert to_dict(cfg) == {"db": {"user": "admin", "password": "s3cret"}}
+
+    # override values are never dumped
+    content = to_yaml(cfg)
+    assert "s3cret" not in content
+    assert "password: !env GAMMA__DB__PASSWORD" in content
+    dumped = json.loads(to_json(cfg, dump=True))
+    assert dumped["db"]["password"] == "!env GAMMA__DB__PASSWORD"
+
+    with pytest.raises(ValueError, match="'GAMMA__X'"):
+        refresh_env_override(cfg, {"GAMMA__X": "!foo bar"})
+    assert cfg["db"]["password"] == "s3cret"
@@ -120,3 +120,30 @@ def test_multi_root(multi_root):
     assert cfg["foo"] == 1
     assert cfg["bar"] == 20
     assert cfg["zzz"] == 30
+
+
+def test_multi_root_path(multi_root):
+    from gamma.config import get_config, push_entry, set_config_roots, to_dict
+
+    t1, t2 = multi_root
+    (Path(t1) / "10-data.yaml").write_text("p1: !path data/x.csv\nsub: {p: !path a}")
+    (Path(t2) / "20-data.yaml").write_text("p2: !path data/y.csv\nsub: {q: !path b}")
+
+    set_config_roots([t1, t2])
+    cfg = get_config()
+    assert cfg._config_roots == [Path(t1), Path(t2)]
+
+    base1, base2 = Path(t1).parent, Path(t2).parent
+    expected = {
+        "p1": str(base1 / "data/x.csv"),
+        "p2": str(base2 / "data/y.csv"),
+        "sub": {"p": str(base1 / "a"), "q": str(base2 / "b")},
+    }
+    assert cfg["p1"] == expected["p1"]
+    assert cfg["sub"]["q"] == expected["sub"]["q"]
+    assert to_dict(cfg) == expected
+
+    # entries not loaded from a root folder are ambiguous
+    push_entry(cfg, "zz-override", "p3: !path c")
+    with pytest.raises(ValueError, match="More than one root"):
+        cfg["p3"]
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from gamma.config import (
+    RootConfig,
+    invalidate_memo,
+    memoize_tag,
+    push_entry,
+    to_dict,
+    unmemoize_tag,
+)
+from gamma.config.memo import _MISSING, MemoCache, memo
+
+CALLS = []
+
+
+def counter(name):
+    CALLS.append(name)
+    return len(CALLS)
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    CALLS.clear()
+    memo.clear()
+    yield
+    memo.clear()
+
+
+def test_memo_modifier():
+    src = f"""
+    a: !call:cache {__name__}:counter("a")
+    b: !call:cache=0.2 {__name__}:counter("b")
+    c: !call {__name__}:counter("c")
+    """
+    cfg = RootConfig("dummy", src)
+
+    for _ in range(3):
+        cfg["a"], cfg["b"], cfg["c"]
+    assert CALLS == ["a", "b", "c", "c", "c"]
+
+    # `to_dict` values are memoized apart from item access
+    d = to_dict(cfg)
+    assert d == {"a": 6, "b": 7, "c": 8}
+    assert to_dict(cfg) == {"a": 6, "b": 7, "c": 9}
+    assert len(CALLS) == 9
+
+    # TTL expired
+    time.sleep(0.3)
+    cfg["a"], cfg["b"]
+    assert CALLS[-1] == "b"
+    assert len(CALLS) == 10
+
+    # new root version
+    push_entry(cfg, "zz-override", "d: 1")
+    cfg["a"]
+    assert CALLS[-1] == "a"
+
+
+def test_memo_tag_and_invalidation():
+    src = f"""
+    a: !call {__name__}:counter("a")
+    b: !expr 1 + 1
+    """
+    cfg = RootConfig("dummy", src)
+
+    memoize_tag("!call")
+    try:
+        cfg["a"], cfg["a"]
+        assert CALLS == ["a"]
+
+        cfg["b"]
+        assert invalidate_memo(tag="!expr") == 0
+        assert invalidate_memo(cfg, tag="!call") == 1
+        cfg["a"]
+        assert CALLS == ["a", "a"]
+    finally:
+        unmemoize_tag("!call")
+
+    cfg["a"], cfg["a"]
+    assert len(CALLS) == 4
+
+
+def test_memo_render_options():
+    from gamma.config import ConfigNode
+
+    cfg = RootConfig("dummy", "a: {b: [1, 2]}\nr: !ref a")
+
+    memoize_tag("!ref")
+    try:
+        # recursive and non recursive renders are kept apart
+        assert isinstance(cfg["r"], ConfigNode)
+        out = to_dict(cfg)
+        assert out["r"] == {"b": [1, 2]}
+        assert isinstance(cfg["r"], ConfigNode)
+
+        # containers are not shared with callers
+        out["r"]["b"].append(3)
+        assert to_dict(cfg)["r"] == {"b": [1, 2]}
+    finally:
+        unmemoize_tag("!ref")
+
+
+def test_memo_lru():
+    from ruamel.yaml.nodes import ScalarNode
+
+    cache = MemoCache(maxsize=2)
+    nodes = [ScalarNode("!foo", str(i)) for i in range(3)]
+    for i, node in enumerate(nodes):
+        cache.set((id(node), 0, 0, False), node, i, None)
+        cache.get((id(nodes[0]), 0, 0, False), nodes[0])
+
+    assert len(cache) == 2
+    assert cache.get((id(nodes[0]), 0, 0, False), nodes[0]) == 0
+    assert cache.get((id(nodes[1]), 0, 0, False), nodes[1]) is _MISSING
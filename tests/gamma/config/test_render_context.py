@@ -97,6 +97,38 @@ level0:
     assert cfg["level0"]["level1"]["nc"] == 300
 
 
+def test_underscore_context_cache(monkeypatch):
+    from gamma.config import RootConfig, push_entry, render_context
+
+    calls = []
+    find = render_context._find_context_vars
+
+    def counting_find(config):
+        calls.append(config)
+        return find(config)
+
+    monkeypatch.setattr(render_context, "_find_context_vars", counting_find)
+
+    src = """
+    _context:
+      va: 1
+    sub:
+      _context:
+        vb: 2
+      n: !expr va + vb
+    """
+    cfg = RootConfig("dummy", src)
+
+    for _ in range(3):
+        assert cfg["sub"]["n"] == 3
+    assert len(calls) == 1
+
+    # rediscovered when entries change
+    push_entry(cfg, "zz-override", {"_context": {"va": 10}})
+    assert cfg["sub"]["n"] == 12
+    assert len(calls) == 2
+
+
 def test_underscore_nested(monkeypatch):
     from gamma.config import RootConfig
 
@@ -119,3 +151,71 @@ sub:
     cfg = RootConfig("dummy", src)
     assert cfg["sub"]["n1"] == "foo is foo"
     assert cfg["sub"]["n2"] == "bar is bar"
+
+
+def test_context_names():
+    from gamma.config import RootConfig
+    from gamma.config.render_context import get_render_context
+
+    src = """
+_context:
+  boom: !expr 1 / 0
+  foo: bar
+
+a: !expr env["USER"]
+b: !expr foo + "!"
+c: !call os.path:join(foo, "x")
+d: !expr 1 + 1
+"""
+
+    cfg = RootConfig("dummy", src)
+
+    # only referenced context variables are resolved
+    assert cfg["a"] == "dummy"
+    assert cfg["b"] == "bar!"
+    assert cfg["c"] == "bar/x"
+    assert cfg["d"] == 2
+
+    with pytest.raises(ZeroDivisionError):
+        get_render_context(config=cfg)
+
+    ctx = get_render_context(config=cfg, names={"foo", "env"})
+    assert set(ctx) == {"foo", "env"}
+    assert get_render_context(config=cfg, names=()) == {}
+
+
+def test_render_pass(monkeypatch):
+    from gamma.config import RootConfig, to_dict, to_yaml
+    from gamma.config.render_context import ContextVar, context_providers
+
+    calls = {"config": 0, "node": 0}
+
+    def per_config_provider(**kwargs):
+        calls["config"] += 1
+        return [ContextVar("pc", 1)]
+
+    per_config_provider.per_config = True
+
+    def per_node_provider(**kwargs):
+        calls["node"] += 1
+        return [ContextVar("pn", 2)]
+
+    monkeypatch.setattr(
+        "gamma.config.render_context.context_providers",
+        context_providers + [per_config_provider, per_node_provider],
+    )
+
+    n = 50
+    src = "\n".join(f"k{i}: !expr:dump pc + pn + {i}" for i in range(n))
+    cfg = RootConfig("dummy", src)
+
+    d = to_dict(cfg)
+    assert d == {f"k{i}": 3 + i for i in range(n)}
+    assert calls == {"config": 1, "node": n}
+
+    # each call is a new pass
+    to_dict(cfg)
+    assert calls == {"config": 2, "node": 2 * n}
+
+    to_yaml(cfg)
+    assert calls == {"config": 3, "node": 3 * n}
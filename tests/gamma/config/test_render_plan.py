@@ -0,0 +1,70 @@
+from gamma.config import RootConfig, compile_plan, push_entry, to_dict
+from gamma.config.load import load_node
+
+SRC = """
+a: 1
+b:
+  c: [1, 2.5, {d: true}]
+  e: !env PLAN_VAR
+  f: !expr 1 + 1
+g: !call
+  func: os.path:join
+  a: foo
+"""
+
+
+def test_plan_matches_to_dict(monkeypatch):
+    monkeypatch.setenv("PLAN_VAR", "foo")
+    cfg = RootConfig("dummy", SRC)
+    plan = compile_plan(cfg)
+
+    assert plan() == to_dict(cfg)
+    assert to_dict(plan) == to_dict(cfg)
+    assert list(plan()) == list(to_dict(cfg))
+
+    # subtree and raw nodes
+    assert compile_plan(cfg["b"])() == to_dict(cfg["b"])
+    node = load_node("[1, {a: 2}]")
+    assert compile_plan(node)() == to_dict(node)
+
+
+def test_plan_dynamic(monkeypatch):
+    monkeypatch.setenv("PLAN_VAR", "foo")
+    cfg = RootConfig("dummy", SRC)
+    plan = compile_plan(cfg)
+    first = plan()
+    assert first["b"]["e"] == "foo"
+
+    # dynamic tags are evaluated on each run
+    monkeypatch.setenv("PLAN_VAR", "bar")
+    second = plan()
+    assert second["b"]["e"] == "bar"
+
+    # outputs are not shared between runs
+    assert second["b"]["c"] is not first["b"]["c"]
+
+
+def test_plan_recompile(monkeypatch):
+    monkeypatch.setenv("PLAN_VAR", "foo")
+    cfg = RootConfig("dummy", SRC)
+    plan = compile_plan(cfg)
+    assert plan()["a"] == 1
+
+    push_entry(cfg, "zz-override", {"a": 2})
+    assert plan()["a"] == 2
+
+    # child nodes are looked up again from the root
+    cfg = RootConfig("dummy", "sub: {x: 1, y: !expr 1 + 1}")
+    plan = compile_plan(cfg["sub"])
+    assert plan() == {"x": 1, "y": 2}
+
+    push_entry(cfg, "zz-override", {"sub": {"x": 10}})
+    assert plan() == {"x": 10, "y": 2}
+
+    # the render config follows the refreshed child node
+    cfg = RootConfig("dummy", "sub: {_context: {k: 1}, v: !expr k}")
+    plan = compile_plan(cfg["sub"])
+    assert plan()["v"] == 1
+
+    push_entry(cfg, "zz-override", {"sub": {"_context": {"k": 2}}})
+    assert plan()["v"] == 2 == to_dict(cfg["sub"])["v"]
@@ -0,0 +1,138 @@
+import sqlite3
+import time
+
+import pytest
+
+from gamma.config import (
+    RootConfig,
+    SQLiteSecretBackend,
+    register_secret_backend,
+    to_dict,
+    to_yaml,
+)
+from gamma.config.secrets import clear_secrets, secret_backends
+from gamma.config.tags import TagException
+
+
+class CountingBackend(SQLiteSecretBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def get_secrets(self, keys):
+        self.calls.append(sorted(keys))
+        return super().get_secrets(keys)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    path = tmp_path / "secrets.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE secrets (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany(
+            "INSERT INTO secrets VALUES (?, ?)",
+            [("user", "admin"), ("password", "s3cr3t"), ("token", "abc")],
+        )
+    backend = CountingBackend(path, ttl=0.2)
+    register_secret_backend("test", backend)
+    yield backend
+    secret_backends.pop("test", None)
+    clear_secrets()
+
+
+def test_secret_batched(backend):
+    src = """
+    db:
+        user: !secret:test user
+        password: !secret:test password
+    items:
+        - !secret:test token
+        - plain
+    """
+    cfg = RootConfig("dummy", src)
+
+    assert to_dict(cfg) == {
+        "db": {"user": "admin", "password": "s3cr3t"},
+        "items": ["abc", "plain"],
+    }
+    assert backend.calls == [["password", "token", "user"]]
+
+    # direct access goes through the cache
+    assert cfg["db"]["user"] == "admin"
+    assert len(backend.calls) == 1
+
+    # never dumped
+    assert "admin" not in to_yaml(cfg)
+    assert "!secret:test user" in to_yaml(cfg)
+
+
+def test_secret_ttl(backend):
+    cfg = RootConfig("dummy", "a: !secret:test user")
+
+    assert cfg["a"] == "admin"
+    assert cfg["a"] == "admin"
+    assert len(backend.calls) == 1
+
+    time.sleep(0.3)
+    assert cfg["a"] == "admin"
+    assert len(backend.calls) == 2
+
+    clear_secrets("test")
+    assert cfg["a"] == "admin"
+    assert len(backend.calls) == 3
+
+
+def test_secret_errors(backend):
+    cfg = RootConfig("dummy", "a: !secret:test missing\nb: !secret:other user")
+
+    with pytest.raises(TagException, match="not found"):
+        cfg["a"]
+
+    with pytest.raises(TagException, match="not registered"):
+        to_dict(cfg)
+
+
+def test_secret_nested_render(backend):
+    import json
+
+    from ruamel.yaml.nodes import MappingNode
+
+    from gamma.config import dispatch, to_json
+    from gamma.config.tags import Tag
+
+    NestedTag = Tag["!test_secret_nested"]
+
+    @dispatch
+    def render_node(node: MappingNode, tag: NestedTag, **ctx):
+        return to_dict(node, **ctx)
+
+    src = """
+    a: !secret:test user
+    n: !test_secret_nested
+        p: !secret:test password
+    z: [plain, !secret:test token]
+    """
+    cfg = RootConfig("dummy", src)
+    expected = {"a": "admin", "n": {"p": "s3cr3t"}, "z": ["plain", "abc"]}
+
+    # nested renders sharing the render pass don't resolve the outer secrets
+    assert to_dict(cfg) == expected
+    assert backend.calls == [["password", "token", "user"]]
+
+    # exports fetch all secrets in one batch too
+    clear_secrets()
+    content = to_json(cfg)
+    assert json.loads(content) == expected
+    assert list(json.loads(content)) == list(expected)
+    assert backend.calls[1:] == [["password", "token", "user"]]
+
+
+def test_secret_modifiers(backend):
+    # modifiers follow the backend name
+    cfg = RootConfig("dummy", "a: !secret:test:cache user")
+    assert cfg["a"] == "admin"
+    assert to_dict(cfg) == {"a": "admin"}
+
+    cfg = RootConfig("dummy", "a: !secret:test:foo user")
+    with pytest.raises(AssertionError, match="Invalid tag"):
+        cfg["a"]
@@ -4,7 +4,7 @@ from pathlib import Path
 import pytest
 from beartype.typing import NamedTuple
 
-from gamma.config import RootConfig, ScalarNode, render_node, to_dict
+from gamma.config import RootConfig, ScalarNode, push_entry, render_node, to_dict
 from gamma.config.builtin_tags import RefTag
 
 
@@ -157,7 +157,11 @@ def _custom_j2_env():
 
 
 def test_j2_env():
-    from gamma.config.builtin_tags import j2_cache
+    from concurrent.futures import ThreadPoolExecutor
+
+    from jinja2 import StrictUndefined
+
+    from gamma.config.builtin_tags import get_j2_env
 
     src = """
     j2_env: %(mod)s:_custom_j2_env
@@ -166,18 +170,34 @@ def test_j2_env():
         "mod": __name__
     }
 
-    try:
-        # remove j2 env cache
-        if hasattr(j2_cache, "env"):
-            del j2_cache.env
+    cfg = RootConfig("dummy", src)
+    myval = cfg["myval"]
+    assert myval == "4 = 4"
+    assert get_j2_env(cfg).undefined is not StrictUndefined
 
-        cfg = RootConfig("dummy", src)
-        myval = cfg["myval"]
-        assert myval == "4 = 4"
+    # environment is per root, shared across threads and rebuilt when entries change
+    env = get_j2_env(cfg)
+    with ThreadPoolExecutor(2) as pool:
+        assert pool.submit(get_j2_env, cfg).result() is env
+    assert get_j2_env(RootConfig("dummy", "a: 1")) is not env
+    push_entry(cfg, "zz-override", {"j2_env": None})
+    assert get_j2_env(cfg) is not env
+    assert get_j2_env(cfg).undefined is StrictUndefined
 
-    finally:
-        if hasattr(j2_cache, "env"):
-            del j2_cache.env
+
+def test_j2_bytecode_cache(tmp_path):
+    src = f"""
+    j2_bytecode_cache: {tmp_path}
+    myval: !j2 "{{{{ 2 + 2 }}}} = 4"
+    """
+
+    cfg = RootConfig("dummy", src)
+    assert cfg["myval"] == "4 = 4"
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # a new root loads the compiled template from the bytecode cache
+    cfg = RootConfig("dummy", src)
+    assert cfg["myval"] == "4 = 4"
 
 
 def test_j2_strict():
@@ -215,3 +235,329 @@ def test_env(monkeypatch):
     assert cfg["e4"] is True
     assert cfg["e5"] is False
     assert cfg["e6"] == "foo"
+
+
+def test_env_cache(monkeypatch):
+    from gamma.config import builtin_tags, refresh_env, set_env_detection
+
+    loads = []
+    yaml_load = builtin_tags.yaml.load
+    monkeypatch.setattr(
+        builtin_tags.yaml, "load", lambda v: loads.append(v) or yaml_load(v)
+    )
+    builtin_tags.parse_env_value.cache_clear()
+
+    monkeypatch.setenv("E1", "[1, 2]")
+    cfg = RootConfig("dummy", "e1: !env E1")
+
+    # parsed once, values are not shared
+    cfg["e1"].append(3)
+    assert cfg["e1"] == [1, 2]
+    assert loads == ["[1, 2]"]
+
+    # changes are detected by default
+    monkeypatch.setenv("E1", "[3]")
+    assert cfg["e1"] == [3]
+
+    # with detection off, values are kept until refreshed
+    set_env_detection(False)
+    try:
+        assert cfg["e1"] == [3]
+        monkeypatch.setenv("E1", "[4]")
+        assert cfg["e1"] == [3]
+        refresh_env()
+        assert cfg["e1"] == [4]
+
+        # a single cache entry per variable
+        from gamma.config.cache import cache
+
+        refresh_env()
+        cfg["e1"]
+        assert sum(1 for k in cache if k[:2] == ("env", "E1")) == 1
+    finally:
+        set_env_detection(True)
+
+    monkeypatch.setenv("E1", "[5]")
+    assert cfg["e1"] == [5]
+
+
+def test_expr_code_cache():
+    from gamma.config.builtin_tags import compile_expr
+
+    cfg = RootConfig("dummy", "a: !expr 40 + 2")
+    assert cfg["a"] == 42
+    hits = compile_expr.cache_info().hits
+    assert cfg["a"] == 42
+    assert compile_expr.cache_info().hits == hits + 1
+
+
+def test_expr_eager_compile():
+    src = """
+    a: !expr 1 + 1
+    b: !expr:dump 1 +
+    """
+
+    # by default, errors are raised on render
+    cfg = RootConfig("dummy", src)
+    assert cfg["a"] == 2
+    with pytest.raises(SyntaxError):
+        cfg["b"]
+
+    meta = {"__eager_compile__": True}
+    with pytest.raises(ValueError, match="'!expr:dump' node in entry 'dummy', line 3"):
+        RootConfig("dummy", src, meta=meta)
+
+
+def test_j2_template_cache():
+    import gc
+    import weakref
+
+    from gamma.config import config_context
+    from gamma.config.builtin_tags import get_j2_env, get_j2_template
+
+    src = """
+    _context:
+      boom: !expr 1 / 0
+      foo: bar
+    myval: !j2 "{{ foo }}-{{ env['USER'] }}"
+    """
+    source = "{{ foo }}-{{ env['USER'] }}"
+
+    cfg = RootConfig("dummy", src)
+    with pytest.raises(ZeroDivisionError):
+        cfg["_context"]["boom"]
+
+    # only referenced context variables are resolved
+    assert cfg["myval"] == "bar-dummy"
+    template, names = get_j2_template(get_j2_env(cfg), source)
+    assert names == {"foo", "env"}
+
+    # compiled template is reused
+    assert cfg["myval"] == "bar-dummy"
+    assert get_j2_template(get_j2_env(cfg), source)[0] is template
+
+    # environments and their templates are released when rebuilt
+    envs = []
+    for i in range(20):
+        with config_context(cfg, {"_context": {"foo": str(i)}}):
+            assert cfg["myval"] == f"{i}-dummy"
+            envs.append(weakref.ref(get_j2_env(cfg)))
+    del template
+    gc.collect()
+    assert sum(env() is not None for env in envs) <= 1
+
+
+def test_ref_memoized(monkeypatch):
+    from gamma.config.builtin_tags import parse_ref_path
+
+    assert parse_ref_path("a.'b.c'.d") == ("a", "b.c", "d")
+
+    src = """
+    a:
+      b: !env REF_VAR
+    c: !ref a.b
+    d: !ref c
+    e: !ref a
+    """
+
+    monkeypatch.setenv("REF_VAR", "foo")
+    cfg = RootConfig("dummy", src)
+    assert cfg["c"] == "foo"
+    assert cfg["d"] == "foo"
+    assert cfg["e"]["b"] == "foo"
+    target = cfg._cache[("ref", ("a", "b"))]
+
+    # target is memoized, but still rendered on each access
+    monkeypatch.setenv("REF_VAR", "bar")
+    assert cfg["c"] == "bar"
+    assert cfg._cache[("ref", ("a", "b"))] is target
+
+    # memoized targets are dropped when entries change
+    push_entry(cfg, "zz-override", {"a": {"b": "zaz"}})
+    assert cfg["c"] == "zaz"
+    assert cfg["d"] == "zaz"
+
+
+def test_ref_dynamic_path():
+    mod = __name__
+    src = f"""
+    a: !call {mod}:make_ref_target()
+    b: !ref a.foo
+    """
+
+    cfg = RootConfig("dummy", src)
+    assert cfg["b"] == 100
+
+
+def make_ref_target():
+    return {"foo": 100}
+
+
+def test_parse_tag():
+    from gamma.config.builtin_tags import get_modifiers
+    from gamma.config.tags import Str, Tag, parse_tag
+
+    info = parse_tag("!call:dump:timeout=2")
+    assert info is parse_tag("!call:dump:timeout=2")
+    assert info.scheme == "!call"
+    assert info.path == "dump:timeout=2"
+    assert info.modifiers == ("dump", "timeout=2")
+    assert isinstance(info.tag, Tag["!call:dump:timeout=2"])
+    assert isinstance(info.scheme_tag, Tag["!call"])
+
+    info = parse_tag(Str().name)
+    assert info.path is None
+    assert info.scheme == Str().name
+    assert isinstance(info.tag, Str)
+
+    assert get_modifiers(info.path) == []
+    assert get_modifiers("dump:timeout=2", "!call") == ["dump", "timeout=2"]
+    with pytest.raises(AssertionError, match="Invalid tag"):
+        get_modifiers("dump:foo")
+    with pytest.raises(AssertionError, match="Invalid tag"):
+        get_modifiers("dump:timeout=2")
+
+
+def test_include_tag(tmp_path):
+    from gamma.config import to_yaml
+    from gamma.config.confignode import ConfigNode
+
+    (tmp_path / "routes.yaml").write_text("a: 1\nb: [x, y]\nc: !expr 1 + 1\n")
+    (tmp_path / "flags.json").write_text('{"on": true}')
+
+    src = """
+    routes: !include routes.yaml
+    flags: !include flags.json
+    missing: !include missing.yaml
+    """
+    root = RootConfig("dummy", src)
+    root._config_roots = [tmp_path]
+
+    # loaded lazily, as a subtree
+    routes = root["routes"]
+    assert isinstance(routes, ConfigNode)
+    assert routes["b"] == ["x", "y"]
+    assert root["flags"]["on"] is True
+    assert to_dict(root["routes"]) == {"a": 1, "b": ["x", "y"], "c": 2}
+    assert "!expr 1 + 1" in to_yaml(root["routes"])
+
+    with pytest.raises(FileNotFoundError):
+        root["missing"]
+
+    # reloaded when the file changes
+    (tmp_path / "routes.yaml").write_text("a: 100\n")
+    assert to_dict(root["routes"]) == {"a": 100}
+
+
+def test_file_tag(tmp_path):
+    import copy
+    import gc
+    import weakref
+    from concurrent.futures import ThreadPoolExecutor
+
+    from ruamel.yaml import YAML
+
+    from gamma.config import to_yaml
+
+    config_root = tmp_path / "config"
+    config_root.mkdir()
+    (tmp_path / "blob.bin").write_bytes(b"\x00\x01\x02")
+    (tmp_path / "hello.txt").write_text("olá")
+    (tmp_path / "empty.bin").write_bytes(b"")
+
+    src = """
+    blob: !file blob.bin
+    same: !file:bytes blob.bin
+    text: !file:text hello.txt
+    empty: !file empty.bin
+    """
+    root = RootConfig("dummy", src)
+    root._config_roots = [config_root]
+
+    blob = root["blob"]
+    assert isinstance(blob, memoryview) and blob.readonly
+    assert blob.tobytes() == b"\x00\x01\x02"
+    assert root["text"] == "olá"
+    assert root["empty"].tobytes() == b""
+
+    # mappings are shared
+    with ThreadPoolExecutor(4) as executor:
+        views = list(executor.map(root.__getitem__, ["blob", "same"] * 4))
+    assert all(view is blob for view in views)
+
+    assert "!file:text hello.txt" in to_yaml(root)
+
+    # forced dumps write binary or text scalars
+    dumped = RootConfig("dummy", "b: !file:dump blob.bin\nt: !file:text:dump hello.txt")
+    dumped._config_roots = [config_root]
+    content = to_yaml(dumped)
+    assert "b: !!binary" in content
+    assert YAML(typ="safe").load(content) == {"b": b"\x00\x01\x02", "t": "olá"}
+
+    (tmp_path / "hello.txt").write_text("hello world")
+    assert root["text"] == "hello world"
+
+    # rendered trees get bytes, so they can be copied and pickled
+    expected = {"blob": b"\x00\x01\x02", "same": b"\x00\x01\x02", "empty": b""}
+    out = to_dict(root)
+    assert out == {**expected, "text": "hello world"}
+    assert copy.deepcopy(out) == out
+    assert to_dict(root, workers=2, pool="process") == out
+
+    # other tags don't accept the !file modifiers
+    bad = RootConfig("dummy", "a: !env:bytes FOO")
+    with pytest.raises(AssertionError, match="Invalid tag"):
+        bad["a"]
+
+    # mappings are released with the root config
+    mapping = weakref.ref(root["blob"].obj)
+    del root, blob, views
+    gc.collect()
+    assert mapping() is None
+
+
+def test_array_tag():
+    from array import array
+
+    from gamma.config import to_yaml
+    from gamma.config.builtin_tags import _get_numpy, get_modifiers_array
+    from gamma.config.tags import TagException
+
+    src = """
+    default: !array [0.5, 1, .inf]
+    f4: !array:f4 [0.5, 1.5]
+    i4: !array:i4 [1, 0o17, 0x10]
+    i8: !array:i8
+      - 1
+      - !expr 2 ** 40
+    bad: !array:u2 [1]
+    text: !array [1, abc]
+    overflow: !array:i4 [1, 0x1ffffffff]
+    overflow_plain: !array:i4 [1, 99999999999]
+    quoted: !array ['5', 1]
+    inf_str: !array [inf, nan]
+    """
+    root = RootConfig("dummy", src)
+
+    assert list(root["default"]) == [0.5, 1.0, float("inf")]
+    assert list(root["f4"]) == [0.5, 1.5]
+    assert list(root["i4"]) == [1, 15, 16]
+    assert list(root["i8"]) == [1, 2**40]
+
+    if _get_numpy() is None:
+        assert isinstance(root["i4"], array) and root["i4"].typecode == "i"
+    else:
+        assert root["i4"].dtype == _get_numpy().int32
+
+    with pytest.raises(TagException, match="Invalid !array type"):
+        root["bad"]
+    for key in ("text", "overflow", "overflow_plain", "quoted", "inf_str"):
+        with pytest.raises(TagException, match="Invalid !array"):
+            root[key]
+
+    # items are rendered eagerly, even with deferred calls
+    deferred = RootConfig("dummy", 'a: !array:i4:cache [1, !call builtins:int("2")]')
+    assert list(to_dict(deferred, call_executor=True)["a"]) == [1, 2]
+    assert get_modifiers_array("i4:cache=2") == ["i4", "cache=2"]
+
+    assert "!array:f4 [0.5, 1.5]" in to_yaml(root)
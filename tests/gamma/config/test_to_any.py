@@ -1,9 +1,22 @@
 import io
+import json
 
+import pytest
 from ruamel.yaml import YAML
 from ruamel.yaml.nodes import MappingNode
 
-from gamma.config import RootConfig, dispatch, to_dict, to_yaml
+from gamma.config import (
+    FrozenConfig,
+    RootConfig,
+    dispatch,
+    from_binary,
+    from_json,
+    iter_yaml,
+    to_binary,
+    to_dict,
+    to_json,
+    to_yaml,
+)
 from gamma.config.tags import Tag
 
 
@@ -68,6 +81,74 @@ def test_to_yaml_basic():
     assert d == src
 
 
+def test_to_yaml_stream():
+    src = """
+    a: 1
+    b: {x: [1, 2], y: !expr 1 + 1}
+    c: !expr:dump 2 + 2
+    """
+    cfg = RootConfig("dummy", src)
+
+    chunks = list(iter_yaml(cfg))
+    assert chunks == ["a: 1\n", "b: {x: [1, 2], y: !expr 1 + 1}\n", "c: 4\n"]
+    assert list(iter_yaml(cfg["b"], False)) == ["x: [1, 2]\n", "y: !expr 1 + 1\n"]
+
+    stream = io.StringIO()
+    assert to_yaml(cfg, stream=stream) is None
+    assert stream.getvalue() == "".join(chunks) == to_yaml(cfg)
+
+    # empty maps are a single chunk
+    assert list(iter_yaml(RootConfig("dummy", {}))) == ["{}\n"]
+
+
+def test_to_json_and_binary(monkeypatch, tmp_path):
+    import base64
+    import pickle
+
+    monkeypatch.setenv("FOO", "foo")
+    src = """
+    a: 1
+    b: {x: [1, 2.5, null], y: !expr 1 + 1}
+    s: !env FOO
+    n: !array:i4 [1, 2]
+    """
+    cfg = RootConfig("dummy", src)
+    expected = {"a": 1, "b": {"x": [1, 2.5, None], "y": 2}, "s": "foo", "n": [1, 2]}
+
+    # binary data is base64 in JSON, and bytes in the binary format
+    (tmp_path / "blob.bin").write_bytes(b"\x00\xff")
+    blobs = RootConfig("dummy", "f: !file blob.bin")
+    blobs._config_roots = [tmp_path / "config"]
+    encoded = base64.b64encode(b"\x00\xff").decode("ascii")
+    assert json.loads(to_json(blobs)) == {"f": encoded}
+    assert from_binary(to_binary(blobs))["f"] == b"\x00\xff"
+
+    content = to_json(cfg)
+    assert json.loads(content) == expected
+    stream = io.StringIO()
+    to_json(cfg, stream)
+    assert stream.getvalue() == content
+
+    dumped = json.loads(to_json(cfg, dump=True))
+    assert dumped["s"] == "!env FOO"
+    assert dumped["b"]["y"] == "!expr 1 + 1"
+
+    for frozen in (from_json(content), from_binary(to_binary(cfg))):
+        assert isinstance(frozen, FrozenConfig)
+        assert frozen["b"]["x"] == (1, 2.5, None)
+        assert frozen["b"] is frozen["b"] and frozen["b"]["x"] is frozen["b"]["x"]
+        assert to_dict(frozen) == expected
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+        with pytest.raises(TypeError):
+            frozen._data = {}
+
+    assert to_dict(from_binary(to_binary(cfg["b"]))) == expected["b"]
+    assert from_json(to_json(RootConfig("dummy", {}))) == {}
+
+    with pytest.raises(ValueError, match="Invalid config binary"):
+        from_binary(b"not a config")
+
+
 def test_secret_modifiers(monkeypatch):
     src = """
 # test !env
@@ -126,3 +207,73 @@ owo_show: !call:dump
     assert "func" in d["owo"]
     assert "key" in d["owo"]
     assert d["owo_show"] == "foo"
+
+
+def _deep_node(depth):
+    from gamma.config import MappingNode, ScalarNode, SequenceNode
+
+    leaf = ScalarNode("!env", "DEEP_VAR")
+    key = ScalarNode("tag:yaml.org,2002:str", "x")
+    node = MappingNode("tag:yaml.org,2002:map", [(key, leaf)])
+    for i in range(depth):
+        key = ScalarNode("tag:yaml.org,2002:str", f"k{i}")
+        if i % 2:
+            node = SequenceNode("tag:yaml.org,2002:seq", [node])
+        node = MappingNode("tag:yaml.org,2002:map", [(key, node)])
+    return node
+
+
+def test_deeply_nested(monkeypatch):
+    from gamma.config.dump_yaml import dump_node
+
+    monkeypatch.setenv("DEEP_VAR", "foo")
+    depth = 3000
+    cfg = RootConfig("dummy", _deep_node(depth))
+
+    d = to_dict(cfg)
+    for i in reversed(range(depth)):
+        d = d[f"k{i}"]
+        if i % 2:
+            d = d[0]
+    assert d == {"x": "foo"}
+
+    node = dump_node(_deep_node(depth), config=cfg)
+    for i in reversed(range(depth)):
+        node = node.value[0][1]
+        if i % 2:
+            node = node.value[0]
+    assert node.value[0][1].tag == "!env"
+
+
+def test_to_dict_workers(monkeypatch):
+    import pytest
+
+    monkeypatch.setenv("PAR_VAR", "foo")
+    src = """
+    a: !env PAR_VAR
+    b: [1, {c: !expr 1 + 1}]
+    d: !j2 "{{ 2 * 3 }}"
+    e:
+      f: !call os.path:join("x", "y")
+    g: 1
+    """
+    cfg = RootConfig("dummy", src)
+    expected = to_dict(cfg)
+
+    got = to_dict(cfg, workers=4)
+    assert got == expected
+    assert list(got) == list(expected)
+
+    got = to_dict(cfg, workers=2, pool="process")
+    assert got == expected
+    assert list(got) == list(expected)
+
+    assert to_dict(cfg["e"], workers=2) == expected["e"]
+
+    # contexts that can't be pickled fall back to threads
+    with pytest.warns(RuntimeWarning, match="thread pool"):
+        got = to_dict(cfg, workers=2, pool="process", call_executor=True)
+    assert got == expected
+
+    with pytest.raises(ValueError, match="pool"):
+        to_dict(cfg, workers=2, pool="fiber")